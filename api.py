@@ -1,72 +1,296 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List, Dict
-from main import DataGenerator
+from contextlib import asynccontextmanager, contextmanager
+import csv
+import io
+import json
+import threading
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import Table, create_engine, select
+from sqlalchemy.orm import Session as SQLASession, sessionmaker
+from main import DataGenerator, User, Product, Order, EXPORT_TABLES, SCHEMA_PROFILES, engine as default_engine
+from jobs import Job, JobManager
+from utils import Config
 import uvicorn
 from datetime import datetime
 
+# Connection pool shared by all requests for the lifetime of the app
+POOL_SIZE = 10
+MAX_OVERFLOW = 20
+POOL_RECYCLE_SECONDS = 1800
+
+# How often the long-running server checks config.yaml for edits
+CONFIG_RELOAD_SECONDS = 5.0
+
+# Rows fetched per round trip when streaming a table as NDJSON
+STREAM_BATCH_SIZE = 5000
+
+# Generated rows encoded per chunk written to the client by /stream
+STREAM_CHUNK_ROWS = 1000
+
+STREAM_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    Config.enable_hot_reload(CONFIG_RELOAD_SECONDS)
+    app.state.engine = create_engine(
+        default_engine.url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True
+    )
+    app.state.sessionmaker = sessionmaker(bind=app.state.engine)
+    # Generation runs here, off the event loop, on a bounded pool of worker threads
+    app.state.jobs = JobManager()
+    yield
+    app.state.jobs.shutdown()
+    app.state.engine.dispose()
+    Config.disable_hot_reload()
+
+
 app = FastAPI(
     title="Advanced Data Generator API",
     description="REST API for generating realistic test data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Generators are reused per thread and locale, so Faker setup is paid once rather than per request
+_generators = threading.local()
+
+
+@contextmanager
+def borrow_generator(request: Request, session: SQLASession, locale: str = 'en_US') -> Iterator[DataGenerator]:
+    """This thread's generator for locale, bound to session only while the caller uses it"""
+    cache = getattr(_generators, 'by_locale', None)
+    if cache is None:
+        cache = _generators.by_locale = {}
+    if locale not in cache:
+        cache[locale] = DataGenerator(locale=locale, engine=request.app.state.engine)
+    generator = cache[locale]
+    generator.use_session(session)
+    try:
+        yield generator
+    finally:
+        # The cached generator must not keep the session, which its owner closes
+        generator.use_session(None)
+        generator.progress = None
+        generator.schema_profile = None
+
+
+def get_session(request: Request) -> Iterator[SQLASession]:
+    """Per-request session drawn from the application's connection pool"""
+    session = request.app.state.sessionmaker()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _list_rows(session: SQLASession, table: Table, limit: int, offset: int,
+               after_id: Optional[int], response: Response) -> List[Dict[str, Any]]:
+    """One page of rows, keyset-paginated on the primary key when after_id is given"""
+    statement = select(*table.columns).order_by(table.c.id).limit(limit)
+    if after_id is not None:
+        statement = statement.where(table.c.id > after_id)
+    elif offset:
+        statement = statement.offset(offset)
+    rows = [dict(row._mapping) for row in session.execute(statement)]
+    if len(rows) == limit:
+        response.headers['X-Next-After-Id'] = str(rows[-1]['id'])
+    return rows
+
+
+def _stream_ndjson(request: Request, table: Table, after_id: Optional[int]) -> StreamingResponse:
+    """Stream a whole table (from after_id on) as NDJSON with bounded memory"""
+    def lines() -> Iterator[str]:
+        statement = select(*table.columns).order_by(table.c.id)
+        if after_id is not None:
+            statement = statement.where(table.c.id > after_id)
+        # The request-scoped session is closed before the body is sent, so the stream owns its own
+        with request.app.state.sessionmaker() as session:
+            result = session.execute(statement.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE))
+            keys = list(result.keys())
+            for partition in result.partitions():
+                yield ''.join(json.dumps(dict(zip(keys, row)), default=_json_default) + '\n' for row in partition)
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _encode_rows(rows: Iterator[Dict[str, Any]], columns: List[str], format: str) -> Iterator[str]:
+    """Encode rows as NDJSON or CSV text, STREAM_CHUNK_ROWS rows per chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == 'csv':
+        writer.writerow(columns)
+    size = 0
+    for row in rows:
+        values = [row.get(column) for column in columns]
+        if format == 'csv':
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values)), default=_json_default) + '\n')
+        size += 1
+        if size == STREAM_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            size = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
 class GenerationRequest(BaseModel):
-    num_users: Optional[int] = 10
-    num_products: Optional[int] = 20
-    num_orders: Optional[int] = 50
+    num_users: int = Field(10, ge=0)
+    num_products: int = Field(20, ge=0)
+    num_orders: int = Field(50, ge=0)
     locale: Optional[str] = "en_US"
+    bulk: Optional[bool] = False
+    chunk_size: Optional[int] = Field(None, ge=1)
+    workers: int = Field(1, ge=1)
+    output_format: Optional[str] = None
+    schema_profile: Optional[str] = None
+
+class UserOut(BaseModel):
+    id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    phone: Optional[str] = None
+    birth_date: Optional[datetime] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+class ProductOut(BaseModel):
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    category: Optional[str] = None
+    stock_quantity: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+class OrderOut(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    product_id: Optional[int] = None
+    quantity: Optional[int] = None
+    total_price: Optional[float] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
 
 class ExportRequest(BaseModel):
     format: str
     filters: Optional[Dict] = None
+    compression: Optional[str] = None
+    row_group_size: Optional[int] = None
+    workers: int = Field(1, ge=1)
+    part_rows: Optional[int] = None
 
-@app.post("/generate")
-async def generate_data(request: GenerationRequest):
-    try:
-        generator = DataGenerator(locale=request.locale)
-        generator.generate_data(
-            request.num_users,
-            request.num_products,
-            request.num_orders
-        )
-        return {"message": "Data generated successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.post("/generate", status_code=202)
+async def generate_data(request: GenerationRequest, http_request: Request):
+    if request.schema_profile is not None and request.schema_profile not in SCHEMA_PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown schema profile: {request.schema_profile}")
+
+    def run(job: Job):
+        with http_request.app.state.sessionmaker() as session, \
+                borrow_generator(http_request, session, request.locale) as generator:
+            generator.progress = job.advance
+            generator.schema_profile = request.schema_profile
+            generator.generate_data(
+                request.num_users,
+                request.num_products,
+                request.num_orders,
+                bulk=request.bulk,
+                chunk_size=request.chunk_size,
+                workers=request.workers,
+                output_format=request.output_format
+            )
+
+    total_rows = request.num_users + request.num_products + request.num_orders
+    job = http_request.app.state.jobs.submit(total_rows, run)
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request):
+    job = request.app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, request: Request):
+    job = request.app.state.jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
 
 @app.post("/export")
-async def export_data(request: ExportRequest):
+def export_data(request: ExportRequest, http_request: Request, session: SQLASession = Depends(get_session)):
     try:
-        generator = DataGenerator()
-        generator.export_data(request.format)
+        with borrow_generator(http_request, session) as generator:
+            generator.export_data(request.format, compression=request.compression,
+                                  row_group_size=request.row_group_size, workers=request.workers,
+                                  part_rows=request.part_rows)
         return {"message": f"Data exported to {request.format} successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/users")
-async def get_users(limit: int = 100, offset: int = 0):
+@app.get("/stream/{entity}")
+def stream_generated(request: Request, entity: str, count: int = Query(100, ge=0), seed: Optional[int] = None,
+                     locale: str = 'en_US', format: str = 'ndjson',
+                     num_users: int = Query(1000, ge=1), num_products: int = Query(100, ge=1)):
+    """Generate rows on the fly and stream them without touching the database"""
+    if entity not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity {entity}")
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format {format}")
+    # A fresh generator per stream, so a seed gives the same rows no matter what ran before
+    generator = DataGenerator(locale=locale, seed=seed, engine=request.app.state.engine)
+    rows = generator.stream_rows(entity, count, num_users, num_products)
+    columns = list(EXPORT_TABLES[entity].columns.keys())
+    # Starlette pulls the next chunk only once the previous one was sent, which is the backpressure
+    return StreamingResponse(_encode_rows(rows, columns, format), media_type=STREAM_MEDIA_TYPES[format])
+
+@app.get("/users", response_model=List[UserOut])
+def get_users(request: Request, response: Response, limit: int = 100, offset: int = 0,
+              after_id: Optional[int] = None, format: str = 'json',
+              session: SQLASession = Depends(get_session)):
     try:
-        generator = DataGenerator()
-        users = generator.session.query(generator.User).offset(offset).limit(limit).all()
-        return [user.__dict__ for user in users]
+        if format == 'ndjson':
+            return _stream_ndjson(request, User.__table__, after_id)
+        return _list_rows(session, User.__table__, limit, offset, after_id, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/products")
-async def get_products(limit: int = 100, offset: int = 0):
+@app.get("/products", response_model=List[ProductOut])
+def get_products(request: Request, response: Response, limit: int = 100, offset: int = 0,
+                 after_id: Optional[int] = None, format: str = 'json',
+                 session: SQLASession = Depends(get_session)):
     try:
-        generator = DataGenerator()
-        products = generator.session.query(generator.Product).offset(offset).limit(limit).all()
-        return [product.__dict__ for product in products]
+        if format == 'ndjson':
+            return _stream_ndjson(request, Product.__table__, after_id)
+        return _list_rows(session, Product.__table__, limit, offset, after_id, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/orders")
-async def get_orders(limit: int = 100, offset: int = 0):
+@app.get("/orders", response_model=List[OrderOut])
+def get_orders(request: Request, response: Response, limit: int = 100, offset: int = 0,
+               after_id: Optional[int] = None, format: str = 'json',
+               session: SQLASession = Depends(get_session)):
     try:
-        generator = DataGenerator()
-        orders = generator.session.query(generator.Order).offset(offset).limit(limit).all()
-        return [order.__dict__ for order in orders]
+        if format == 'ndjson':
+            return _stream_ndjson(request, Order.__table__, after_id)
+        return _list_rows(session, Order.__table__, limit, offset, after_id, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,95 @@
+"""Load-test the read endpoints and report p50/p99 latency
+
+Compares the pooled-session handlers against the previous per-request
+setup, which built a new DataGenerator (Faker instance plus session) for
+every call. Both run against a temporary database.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api import app, get_session, POOL_SIZE, MAX_OVERFLOW
+from main import DataGenerator, Base, User
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+def timed(call) -> float:
+    start = time.perf_counter()
+    call()
+    return (time.perf_counter() - start) * 1000
+
+
+def per_request_generator_app(engine) -> FastAPI:
+    """The previous handler shape: a fresh DataGenerator (Faker instance and session) per call"""
+    baseline = FastAPI()
+
+    @baseline.get('/users')
+    def users(limit: int = 100):
+        generator = DataGenerator(engine=engine)
+        try:
+            users = generator.session.query(User).limit(limit).all()
+            return [{column.key: getattr(user, column.key) for column in User.__table__.columns} for user in users]
+        finally:
+            generator.session.close()
+
+    return baseline
+
+
+def measure(client: TestClient, pool: ThreadPoolExecutor, label: str, url: str, requests: int):
+    latencies = list(pool.map(lambda _: timed(lambda: client.get(url).raise_for_status()), range(requests)))
+    p50, p99 = percentiles(latencies)
+    print(f"{label:>36}: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API read latency benchmark')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+                               pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
+        Base.metadata.create_all(engine)
+        generator = DataGenerator(engine=engine)
+        generator.generate_data(1000, 100, 1000, bulk=True)
+        generator.session.close()
+        bench_sessions = sessionmaker(bind=engine)
+
+        def bench_session():
+            session = bench_sessions()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_session] = bench_session
+        try:
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                with TestClient(per_request_generator_app(engine)) as client:
+                    measure(client, pool, 'per-request generator /users', f'/users?limit={args.limit}', args.requests)
+                with TestClient(app) as client:
+                    for endpoint in ('/users', '/products', '/orders'):
+                        measure(client, pool, endpoint, f'{endpoint}?limit={args.limit}', args.requests)
+        finally:
+            app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
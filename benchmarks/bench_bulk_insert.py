@@ -0,0 +1,41 @@
+"""Compare rows/sec of the ORM and bulk insert paths of DataGenerator.generate_data"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from main import DataGenerator, Base
+
+
+def run(bulk: bool, num_users: int, num_products: int, num_orders: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        generator = DataGenerator(engine=engine)
+        start = time.perf_counter()
+        generator.generate_data(num_users, num_products, num_orders, bulk=bulk)
+        elapsed = time.perf_counter() - start
+        generator.session.close()
+        engine.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk insert benchmark')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--orders', type=int, default=10000)
+    args = parser.parse_args()
+
+    total_rows = args.users + args.products + args.orders
+    for label, bulk in (('orm', False), ('bulk', True)):
+        elapsed = run(bulk, args.users, args.products, args.orders)
+        print(f"{label:>5}: {total_rows} rows in {elapsed:.2f}s ({total_rows / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compare generating into SQLite and exporting against writing files directly"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from main import DataGenerator, Base
+
+
+def via_database(tmp_dir: str, format: str, num_users: int, num_products: int, num_orders: int) -> float:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    Base.metadata.create_all(engine)
+    generator = DataGenerator(engine=engine)
+    start = time.perf_counter()
+    generator.generate_data(num_users, num_products, num_orders, bulk=True)
+    generator.export_data(format, output_dir=os.path.join(tmp_dir, 'export'))
+    elapsed = time.perf_counter() - start
+    generator.session.close()
+    engine.dispose()
+    return elapsed
+
+
+def direct(tmp_dir: str, format: str, num_users: int, num_products: int, num_orders: int) -> float:
+    generator = DataGenerator()
+    start = time.perf_counter()
+    generator.generate_data(num_users, num_products, num_orders, output_format=format,
+                            output_dir=os.path.join(tmp_dir, 'direct'))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Direct-to-file generation benchmark')
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--orders', type=int, default=200000)
+    parser.add_argument('--format', type=str, default='csv')
+    args = parser.parse_args()
+
+    total_rows = args.users + args.products + args.orders
+    for label, run in (('sqlite + export', via_database), ('direct to file', direct)):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            elapsed = run(tmp_dir, args.format, args.users, args.products, args.orders)
+        print(f"{label:>15}: {total_rows} rows in {elapsed:.2f}s ({total_rows / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Show that peak RSS of export_data stays flat as the exported row count grows"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                          capture_output=True, text=True, check=True).stdout
+
+
+def measure(num_orders: int, format: str) -> int:
+    """Seed a database, then export it in a fresh process and return that process's peak RSS in KiB"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup = (
+            "from sqlalchemy import create_engine\n"
+            "from main import DataGenerator, Base\n"
+            f"engine = create_engine('sqlite:///{os.path.join(tmp_dir, 'bench.db')}')\n"
+            "Base.metadata.create_all(engine)\n"
+        )
+        run_python(setup + f"DataGenerator(engine=engine).generate_data(1000, 100, {num_orders}, bulk=True)\n")
+        output = run_python(
+            "import resource\n" + setup +
+            f"DataGenerator(engine=engine).export_data('{format}', output_dir='{tmp_dir}')\n"
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+        )
+    return int(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming export memory benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000, 5000000])
+    parser.add_argument('--format', type=str, default='jsonl')
+    args = parser.parse_args()
+
+    for num_orders in args.sizes:
+        peak = measure(num_orders, args.format)
+        print(f"{num_orders:>9} orders: peak RSS {peak / 1024:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compare ML-enhanced user generation with one prediction per user against one prediction per batch"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import DataGenerator
+from ml_generator import MLDataGenerator
+from vectorized import VECTORIZE_BLOCK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ML inference benchmark')
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--train-users', type=int, default=2000,
+                        help='Users the model is trained on; inference users are resampled from them')
+    parser.add_argument('--row-users', type=int, default=1000,
+                        help='Users timed on the per-row path (it is too slow to run in full)')
+    parser.add_argument('--batch-size', type=int, default=VECTORIZE_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    generator = DataGenerator(seed=0)
+    training = list(generator._user_rows(args.train_users, 1))
+    ml = MLDataGenerator()
+    ml.train_user_pattern_model(training)
+
+    rng = random.Random(0)
+    users = [dict(rng.choice(training), id=args.train_users + i) for i in range(args.users)]
+
+    # Before: one HashingEncoder transform and predict call per user
+    start = time.perf_counter()
+    per_row = [ml.generate_smart_user(user) for user in users[:args.row_users]]
+    row_rate = args.row_users / (time.perf_counter() - start)
+
+    # After: one HashingEncoder transform of the whole batch and one predict call
+    start = time.perf_counter()
+    batched = []
+    for offset in range(0, args.users, args.batch_size):
+        batched.extend(ml.generate_smart_users(users[offset:offset + args.batch_size]))
+    batch_rate = args.users / (time.perf_counter() - start)
+
+    assert per_row == batched[:args.row_users]
+    print(f"per-row: {row_rate:,.0f} users/sec ({args.users / row_rate:.1f}s projected for {args.users} users)")
+    print(f"batched: {batch_rate:,.0f} users/sec ({args.users / batch_rate:.1f}s for {args.users} users)")
+
+
+if __name__ == '__main__':
+    main()
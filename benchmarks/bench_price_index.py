@@ -0,0 +1,51 @@
+"""Compare order generation with a per-order price query against the in-memory price index"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from main import DataGenerator, Base, Product
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Product price index benchmark')
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--orders', type=int, default=1000000)
+    parser.add_argument('--query-orders', type=int, default=20000,
+                        help='Orders timed on the per-query path (it is too slow to run in full)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        generator = DataGenerator(engine=engine)
+        generator.generate_data(1, args.products, 0, bulk=True)
+        product_ids = list(generator.product_prices)
+
+        # Before: one SELECT per order to read the product price
+        start = time.perf_counter()
+        for i in range(args.query_orders):
+            product_id = product_ids[i % len(product_ids)]
+            price = generator.session.query(Product).filter_by(id=product_id).first().price
+            generator._order_row(1, product_id, price)
+        query_rate = args.query_orders / (time.perf_counter() - start)
+
+        # After: price read from the in-memory index
+        start = time.perf_counter()
+        for i in range(args.orders):
+            generator.generate_order(1, product_ids[i % len(product_ids)])
+        index_rate = args.orders / (time.perf_counter() - start)
+
+        generator.session.close()
+        engine.dispose()
+
+    print(f"query: {query_rate:,.0f} orders/sec ({args.orders / query_rate:.1f}s projected for {args.orders} orders)")
+    print(f"index: {index_rate:,.0f} orders/sec ({args.orders / index_rate:.1f}s for {args.orders} orders)")
+
+
+if __name__ == '__main__':
+    main()
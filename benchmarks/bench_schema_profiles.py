@@ -0,0 +1,84 @@
+"""Compare load and query times without indexes, with indexes maintained during the load, and with indexes built after it"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from main import DataGenerator, Base, create_indexes
+
+# Typical dashboard lookups, each run with parameters drawn by sample_params
+QUERIES = {
+    'orders by user': "SELECT * FROM orders WHERE user_id = :user_id",
+    'orders by product': ("SELECT orders.id, orders.quantity, products.name FROM orders "
+                          "JOIN products ON products.id = orders.product_id WHERE orders.product_id = :product_id"),
+    'recent orders by status': "SELECT count(*) FROM orders WHERE status = :status AND created_at >= :since",
+    'products by category': "SELECT * FROM products WHERE category = :category",
+}
+
+
+def sample_params(connection, num_orders: int, rng: random.Random) -> dict:
+    """One parameter set per query, taken from the loaded rows"""
+    return {
+        'user_id': connection.execute(text("SELECT user_id FROM orders WHERE id = :id"),
+                                      {'id': rng.randint(1, num_orders)}).scalar(),
+        'product_id': connection.execute(text("SELECT product_id FROM orders WHERE id = :id"),
+                                         {'id': rng.randint(1, num_orders)}).scalar(),
+        'status': rng.choice(['pending', 'completed', 'cancelled']),
+        # The newest percent of orders
+        'since': connection.execute(text("SELECT created_at FROM orders WHERE id = :id"),
+                                    {'id': max(1, num_orders * 99 // 100)}).scalar(),
+        'category': connection.execute(text("SELECT category FROM products ORDER BY random() LIMIT 1")).scalar(),
+    }
+
+
+def run(mode: str, args) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        generator = DataGenerator(engine=engine, seed=args.seed,
+                                  schema_profile='indexed' if mode == 'indexed after load' else None)
+        if mode == 'indexed during load':
+            create_indexes(generator.session, 'indexed')
+
+        start = time.perf_counter()
+        generator.generate_data(args.users, args.products, args.orders, bulk=True)
+        load_seconds = time.perf_counter() - start
+        generator.session.close()
+
+        rng = random.Random(args.seed)
+        query_seconds = dict.fromkeys(QUERIES, 0.0)
+        with engine.connect() as connection:
+            for _ in range(args.query_repeats):
+                params = sample_params(connection, args.orders, rng)
+                for name, query in QUERIES.items():
+                    start = time.perf_counter()
+                    connection.execute(text(query), params).fetchall()
+                    query_seconds[name] += time.perf_counter() - start
+        engine.dispose()
+    return load_seconds, {name: seconds / args.query_repeats for name, seconds in query_seconds.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Schema profile benchmark')
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--orders', type=int, default=1000000)
+    parser.add_argument('--query-repeats', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    total_rows = args.users + args.products + args.orders
+    for mode in ('no indexes', 'indexed during load', 'indexed after load'):
+        load_seconds, query_seconds = run(mode, args)
+        print(f"{mode}: loaded {total_rows} rows in {load_seconds:.2f}s ({total_rows / load_seconds:,.0f} rows/sec)")
+        for name, seconds in query_seconds.items():
+            print(f"  {name:>24}: {seconds * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Show that peak RSS of streaming generation does not grow with the row count"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(num_orders: int, chunk_size: int) -> int:
+    """Run one generation in a fresh process and return its peak RSS in KiB"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        code = (
+            "import resource\n"
+            "from sqlalchemy import create_engine\n"
+            "from main import DataGenerator, Base\n"
+            f"engine = create_engine('sqlite:///{os.path.join(tmp_dir, 'bench.db')}')\n"
+            "Base.metadata.create_all(engine)\n"
+            f"DataGenerator(engine=engine).generate_data({num_orders // 10}, 100, {num_orders}, "
+            f"chunk_size={chunk_size})\n"
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True
+        ).stdout
+    return int(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming generation memory benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000])
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    for num_orders in args.sizes:
+        peak = measure(num_orders, args.chunk_size)
+        print(f"{num_orders:>9} orders: peak RSS {peak / 1024:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Compare row-by-row validation against the batch validators on generated users, products and orders"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from main import DataGenerator
+from utils import Config, Validator
+from vectorized import VectorizedBackend, iter_rows
+
+
+def timed(label, rows, per_row, batch):
+    start = time.perf_counter()
+    row_valid = [per_row(row)['is_valid'] for row in rows]
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = batch(rows)
+    batch_seconds = time.perf_counter() - start
+
+    assert row_valid == (masks == 0).tolist()
+    print(f"{label}: row-by-row {len(rows) / row_seconds:,.0f} rows/sec, "
+          f"batch {len(rows) / batch_seconds:,.0f} rows/sec ({row_seconds / batch_seconds:.1f}x), "
+          f"{int((masks != 0).sum())} invalid")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch validation benchmark')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--distinct-users', type=int, default=10000,
+                        help='Users generated with Faker and repeated up to --rows')
+    args = parser.parse_args()
+
+    Config.load_config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml'))
+    validator = Validator()
+    generator = DataGenerator(seed=0)
+
+    distinct = list(generator._user_rows(args.distinct_users, 1))
+    users = (distinct * (args.rows // len(distinct) + 1))[:args.rows]
+    timed('users', users, lambda row: validator.validate_user(row, 'en_US'),
+          lambda rows: validator.validate_users(rows, 'en_US'))
+
+    backend = VectorizedBackend(0)
+    products = [dict(row, name='product') for row in iter_rows(backend.product_columns(args.rows))]
+    timed('products', products, validator.validate_product, validator.validate_products)
+
+    prices = backend.product_columns(1000)['price']
+    orders = list(iter_rows(backend.order_columns(args.rows, 1, 1000, 1, prices)))
+    timed('orders', orders, validator.validate_order, validator.validate_orders)
+
+    # Columns as the vectorized backend produces them skip the row dicts entirely
+    columns = backend.order_columns(args.rows, 1, 1000, 1, prices)
+    start = time.perf_counter()
+    validator.validate_orders(columns)
+    print(f"order columns: batch {args.rows / (time.perf_counter() - start):,.0f} rows/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,362 @@
+import io
+import os
+import csv
+import gzip
+import json
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+import yaml
+from sqlalchemy import Column, MetaData, Table, create_engine, func, select, Boolean, DateTime, Float, Integer
+from sqlalchemy.orm import Session as SQLASession
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('json', 'jsonl', 'csv', 'yaml', 'parquet', 'feather')
+
+# Formats written as one file per table
+TABLE_FORMATS = ('csv', 'jsonl', 'parquet', 'feather')
+
+# Rows fetched from the database and written per batch
+EXPORT_BATCH_SIZE = 10000
+
+# Rows per Parquet row group unless overridden
+PARQUET_ROW_GROUP_SIZE = 100000
+
+# Streaming compression for the text table formats, and the suffix each adds
+TEXT_COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+class CSVWriter:
+    """Writes one table as CSV with a header row"""
+
+    def __init__(self, f: TextIO, columns: Sequence[str]):
+        self._writer = csv.writer(f)
+        self._writer.writerow(columns)
+
+    def write_batch(self, rows: Sequence[Sequence]):
+        self._writer.writerows(rows)
+
+    def finish(self):
+        pass
+
+
+class JSONLinesWriter:
+    """Writes one table as JSON Lines, one object per row"""
+
+    def __init__(self, f: TextIO, columns: Sequence[str]):
+        self._f = f
+        self._columns = list(columns)
+
+    def write_batch(self, rows: Sequence[Sequence]):
+        self._f.write(''.join(json.dumps(dict(zip(self._columns, row)), default=str) + '\n' for row in rows))
+
+    def finish(self):
+        pass
+
+
+class JSONArrayWriter:
+    """Writes one table as a JSON array of objects, one batch at a time"""
+
+    def __init__(self, f: TextIO, columns: Sequence[str]):
+        self._f = f
+        self._columns = list(columns)
+        self._separator = ''
+        f.write('[')
+
+    def write_batch(self, rows: Sequence[Sequence]):
+        for row in rows:
+            self._f.write(self._separator)
+            self._f.write(json.dumps(dict(zip(self._columns, row)), default=str))
+            self._separator = ', '
+
+    def finish(self):
+        self._f.write(']')
+
+
+class YAMLSequenceWriter:
+    """Writes one table as a YAML block sequence, one batch at a time"""
+
+    def __init__(self, f: TextIO, columns: Sequence[str]):
+        self._f = f
+        self._columns = list(columns)
+        self._empty = True
+
+    def write_batch(self, rows: Sequence[Sequence]):
+        if not rows:
+            return
+        if self._empty:
+            self._f.write('\n')
+            self._empty = False
+        records = [dict(zip(self._columns, row)) for row in rows]
+        self._f.write(yaml.dump(records, default_flow_style=False))
+
+    def finish(self):
+        if self._empty:
+            self._f.write(' []\n')
+
+
+def arrow_schema(table: Table):
+    """Arrow schema matching a SQLAlchemy table's column types"""
+    import pyarrow as pa
+
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _timestamps(values: Sequence) -> List:
+    # Generated rows can carry plain dates (e.g. birth_date), which Arrow will not cast to timestamps
+    return [datetime.combine(value, time.min) if type(value) is date else value for value in values]
+
+
+def _record_batch(schema, rows: Sequence[Sequence]):
+    import pyarrow as pa
+
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(_timestamps(values) if pa.types.is_timestamp(field.type) else values, type=field.type)
+         for values, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+class ParquetWriter:
+    """Writes one table as Parquet, buffering batches into fixed-size row groups"""
+
+    def __init__(self, path: str, table: Table, compression: Optional[str] = None,
+                 row_group_size: Optional[int] = None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = arrow_schema(table)
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression or 'snappy')
+        self._row_group_size = row_group_size or PARQUET_ROW_GROUP_SIZE
+        self._pending = []
+        self._pending_rows = 0
+
+    def write_batch(self, rows: Sequence[Sequence]):
+        self._pending.append(_record_batch(self._schema, rows))
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self._row_group_size:
+            self._flush(final=False)
+
+    def _flush(self, final: bool):
+        pending = self._pa.Table.from_batches(self._pending, schema=self._schema)
+        while pending.num_rows >= self._row_group_size or (final and pending.num_rows):
+            self._writer.write_table(pending.slice(0, self._row_group_size), row_group_size=self._row_group_size)
+            pending = pending.slice(self._row_group_size)
+        self._pending = pending.to_batches()
+        self._pending_rows = pending.num_rows
+
+    def finish(self):
+        self._flush(final=True)
+        self._writer.close()
+
+
+class FeatherWriter:
+    """Writes one table as a Feather v2 (Arrow IPC) file, one record batch per batch"""
+
+    def __init__(self, path: str, table: Table, compression: Optional[str] = None,
+                 row_group_size: Optional[int] = None):
+        import pyarrow as pa
+
+        self._schema = arrow_schema(table)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        self._writer = pa.ipc.new_file(path, self._schema, options=options)
+
+    def write_batch(self, rows: Sequence[Sequence]):
+        if rows:
+            self._writer.write_batch(_record_batch(self._schema, rows))
+
+    def finish(self):
+        self._writer.close()
+
+
+ARROW_WRITERS = {
+    'parquet': ParquetWriter,
+    'feather': FeatherWriter,
+}
+
+
+def open_text(path: str, compression: Optional[str] = None) -> TextIO:
+    """Open a text file for writing, optionally through a gzip or zstd stream"""
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    if compression == 'zstd':
+        import zstandard
+
+        stream = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+        return io.TextIOWrapper(stream, newline='', encoding='utf-8')
+    if compression:
+        raise ValueError(f"Unsupported text compression: {compression}")
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def table_file_name(table_name: str, format: str, compression: Optional[str] = None, part: Optional[int] = None) -> str:
+    name = table_name if part is None else f'{table_name}.part-{part:05d}'
+    suffix = TEXT_COMPRESSION_SUFFIXES.get(compression, '') if format not in ARROW_WRITERS else ''
+    return f'{name}.{format}{suffix}'
+
+
+def iter_batches(session: SQLASession, table: Table, batch_size: int = EXPORT_BATCH_SIZE,
+                 id_range: Optional[Tuple[int, int]] = None) -> Iterator[List]:
+    """Stream a table's rows in batches through a server-side cursor"""
+    statement = select(*table.columns).order_by(*table.primary_key.columns)
+    if id_range is not None:
+        primary_key = table.primary_key.columns.values()[0]
+        statement = statement.where(primary_key >= id_range[0], primary_key < id_range[1])
+    result = session.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+    for partition in result.partitions():
+        yield partition
+
+
+def _export_table(session: SQLASession, table: Table, writer, batch_size: int,
+                  id_range: Optional[Tuple[int, int]] = None) -> int:
+    count = 0
+    for batch in iter_batches(session, table, batch_size, id_range):
+        writer.write_batch(batch)
+        count += len(batch)
+    writer.finish()
+    return count
+
+
+def _export_table_file(session: SQLASession, table: Table, format: str, path: str, batch_size: int,
+                       compression: Optional[str], row_group_size: Optional[int],
+                       id_range: Optional[Tuple[int, int]] = None) -> int:
+    if format in ARROW_WRITERS:
+        writer = ARROW_WRITERS[format](path, table, compression, row_group_size)
+        return _export_table(session, table, writer, batch_size, id_range)
+    writer_class = CSVWriter if format == 'csv' else JSONLinesWriter
+    with open_text(path, compression) as f:
+        return _export_table(session, table, writer_class(f, table.columns.keys()), batch_size, id_range)
+
+
+def export_tables(session: SQLASession, tables: Dict[str, Table], format: str = 'json',
+                  output_dir: str = '.', batch_size: int = EXPORT_BATCH_SIZE,
+                  compression: Optional[str] = None, row_group_size: Optional[int] = None) -> List[str]:
+    """Stream tables to files in the given format and return the written paths"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = []
+    if format in TABLE_FORMATS:
+        for table_name, table in tables.items():
+            path = os.path.join(output_dir, table_file_name(table_name, format, compression))
+            count = _export_table_file(session, table, format, path, batch_size, compression, row_group_size)
+            logger.info(f"Exported {count} rows to {path}")
+            paths.append(path)
+    elif format == 'json':
+        path = os.path.join(output_dir, 'exported_data.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for index, (table_name, table) in enumerate(tables.items()):
+                f.write(f'{", " if index else ""}{json.dumps(table_name)}: ')
+                _export_table(session, table, JSONArrayWriter(f, table.columns.keys()), batch_size)
+            f.write('}')
+        paths.append(path)
+    else:
+        path = os.path.join(output_dir, 'exported_data.yaml')
+        with open(path, 'w', encoding='utf-8') as f:
+            for table_name, table in tables.items():
+                f.write(f'{table_name}:')
+                _export_table(session, table, YAMLSequenceWriter(f, table.columns.keys()), batch_size)
+        paths.append(path)
+    return paths
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _detached_table(table: Table) -> Table:
+    """Copy of a table with only names and types, so it can be pickled to worker processes"""
+    return Table(table.name, MetaData(), *(
+        Column(column.name, column.type, primary_key=column.primary_key) for column in table.columns
+    ))
+
+
+def _export_part(database_url: str, table: Table, format: str, path: str, batch_size: int,
+                 compression: Optional[str], row_group_size: Optional[int],
+                 id_range: Optional[Tuple[int, int]]) -> Tuple[int, str]:
+    """Write one table part inside a worker process and return its row count and checksum"""
+    engine = create_engine(database_url)
+    try:
+        with SQLASession(engine) as session:
+            count = _export_table_file(session, table, format, path, batch_size, compression,
+                                       row_group_size, id_range)
+    finally:
+        engine.dispose()
+    return count, sha256_file(path)
+
+
+def _part_ranges(session: SQLASession, table: Table, part_rows: Optional[int]) -> List[Optional[Tuple[int, int]]]:
+    """Primary key ranges splitting a table into parts of about part_rows rows"""
+    if not part_rows:
+        return [None]
+    primary_key = table.primary_key.columns.values()[0]
+    low, high = session.execute(select(func.min(primary_key), func.max(primary_key))).one()
+    if low is None:
+        return [None]
+    return [(start, start + part_rows) for start in range(low, high + 1, part_rows)]
+
+
+def export_tables_parallel(session: SQLASession, tables: Dict[str, Table], format: str = 'csv',
+                           output_dir: str = '.', batch_size: int = EXPORT_BATCH_SIZE,
+                           compression: Optional[str] = None, row_group_size: Optional[int] = None,
+                           workers: int = 4, part_rows: Optional[int] = None) -> Dict[str, Any]:
+    """Export every table (and every part of large tables) concurrently and write a manifest"""
+    if format not in TABLE_FORMATS:
+        raise ValueError(f"Parallel export supports {', '.join(TABLE_FORMATS)}, not {format}")
+    os.makedirs(output_dir, exist_ok=True)
+    database_url = session.get_bind().url.render_as_string(hide_password=False)
+
+    futures = []
+    with ProcessPoolExecutor(workers) as pool:
+        for table_name, table in tables.items():
+            ranges = _part_ranges(session, table, part_rows)
+            for part, id_range in enumerate(ranges):
+                file_name = table_file_name(table_name, format, compression, part if len(ranges) > 1 else None)
+                future = pool.submit(_export_part, database_url, _detached_table(table), format,
+                                     os.path.join(output_dir, file_name), batch_size, compression,
+                                     row_group_size, id_range)
+                futures.append((table_name, file_name, future))
+
+        files = []
+        for table_name, file_name, future in futures:
+            rows, checksum = future.result()
+            files.append({'table': table_name, 'path': file_name, 'rows': rows, 'sha256': checksum})
+
+    manifest = {
+        'format': format,
+        'compression': compression,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'tables': {name: sum(f['rows'] for f in files if f['table'] == name) for name in tables},
+        'files': files
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Exported {len(files)} files to {output_dir}")
+    return manifest
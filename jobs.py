@@ -0,0 +1,136 @@
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default number of jobs allowed to run at the same time
+DEFAULT_JOB_WORKERS = 2
+
+# Finished jobs are forgotten once they are older than this or the history holds more of them
+DEFAULT_JOB_TTL_SECONDS = 3600
+DEFAULT_JOB_HISTORY = 1000
+
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested"""
+
+
+class Job:
+    """A background generation job and its progress"""
+
+    def __init__(self, total_rows: int):
+        self.id = uuid.uuid4().hex
+        self.status = 'pending'
+        self.total_rows = total_rows
+        self.rows_done = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel_requested = threading.Event()
+        self._future: Optional[Future] = None
+
+    def advance(self, entity: str, rows: int):
+        """Progress callback for DataGenerator; also the point where cancellation takes effect"""
+        self.rows_done += rows
+        if self._cancel_requested.is_set():
+            raise JobCancelled(f"Job {self.id} cancelled while generating {entity}")
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.rows_done / elapsed if elapsed > 0 else None
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rows_per_sec
+        if self.status != 'running' or not rate:
+            return None
+        return max(self.total_rows - self.rows_done, 0) / rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'rows_produced': self.rows_done,
+            'rows_per_sec': self.rows_per_sec,
+            'eta_seconds': self.eta_seconds,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Runs jobs on a bounded thread pool and keeps track of their state"""
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, ttl_seconds: float = DEFAULT_JOB_TTL_SECONDS,
+                 max_history: int = DEFAULT_JOB_HISTORY):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+        self.max_history = max_history
+
+    def submit(self, total_rows: int, work: Callable[[Job], None]) -> Job:
+        """Queue work(job) and return the job immediately"""
+        job = Job(total_rows)
+        with self._lock:
+            self._evict()
+            self._jobs[job.id] = job
+        job._future = self._executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job: Job, work: Callable[[Job], None]):
+        if job._cancel_requested.is_set():
+            job.status = 'cancelled'
+            return
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            work(job)
+            job.status = 'completed'
+        except JobCancelled:
+            job.status = 'cancelled'
+            logger.info(f"Job {job.id} cancelled")
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            logger.error(f"Job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self):
+        """Forget finished jobs past their TTL, then the oldest ones beyond max_history; callers hold the lock"""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.status in FINISHED_STATUSES]
+        expired = [job for job in finished if now - (job.finished_at or job.created_at) > self.ttl_seconds]
+        finished.sort(key=lambda job: job.finished_at or job.created_at)
+        expired.extend(finished[:max(len(finished) - self.max_history, 0)])
+        for job in expired:
+            self._jobs.pop(job.id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start, running jobs stop at their next progress report"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        job._cancel_requested.set()
+        if job._future is not None and job._future.cancel():
+            job.status = 'cancelled'
+        return job
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,15 +1,24 @@
 import os
 import logging
 import argparse
-from typing import List, Dict, Any
+import random
+import threading
+import time
+import numpy as np
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from faker import Faker
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean
-from sqlalchemy.orm import declarative_base, sessionmaker
-from datetime import datetime, timezone
-import json
-import csv
-import yaml
-from ml_generator import MLDataGenerator
+from sqlalchemy import create_engine, func, select, text, Column, Integer, String, Float, DateTime, Boolean
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base, sessionmaker, Session as SQLASession
+from datetime import date, datetime, timedelta, timezone
+from exporters import EXPORT_BATCH_SIZE, EXPORT_FORMATS, export_tables, export_tables_parallel
+from sinks import FILE_SINK_FORMATS, FileSink, advance_id_sequences, chunked, database_sink
+from utils import Config, ValidationStats, Validator
+from value_pools import ValuePool
+from vectorized import ORDER_STATUSES, VECTORIZE_MIN_BATCH, VectorizedBackend, blocks, iter_rows, price_array
 
 # Configure logging
 logging.basicConfig(
@@ -27,10 +36,29 @@ fake = Faker(['en_US', 'fa_IR'])
 
 # Database setup
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-db_path = os.path.join(BASE_DIR, 'sample_data.db')
-engine = create_engine(f'sqlite:///{db_path}')
+# SQLite file by default; database.url in config.yaml or DATABASE_URL selects another backend such as PostgreSQL
+engine = create_engine(Config.get_database_url())
 Base = declarative_base()
 
+# Rows sent per executemany call in bulk mode
+BULK_BATCH_SIZE = 10000
+
+# Rows generated between progress callbacks
+PROGRESS_INTERVAL = 1000
+
+# Rounds of batched regeneration for rows failing validation before generation gives up
+MAX_REJECTION_ROUNDS = 20
+
+# Birth dates of seeded runs are drawn relative to this date, so a seed reproduces them on any day
+SEED_REFERENCE_DATE = date(2025, 1, 1)
+
+# Age range of generated users when no validation rules apply, as in Faker's date_of_birth
+MIN_AGE = 0
+MAX_AGE = 115
+
+# Trained ML models are cached here and reused while the users table is unchanged
+ML_MODEL_CACHE_DIR = os.path.join(BASE_DIR, '.model_cache')
+
 class User(Base):
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True)
@@ -62,119 +90,681 @@ class Order(Base):
     status = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+# Tables written by export_data, in export order
+EXPORT_TABLES = {
+    'users': User.__table__,
+    'products': Product.__table__,
+    'orders': Order.__table__
+}
+
+# Secondary indexes of each schema profile, as index name -> (table, columns). They are not declared on
+# the models so that create_all leaves them out and generate_data can build them after loading the rows.
+SCHEMA_PROFILES: Dict[str, Dict[str, Tuple[str, Tuple[str, ...]]]] = {
+    'minimal': {},
+    'indexed': {
+        'ix_orders_user_id': ('orders', ('user_id',)),
+        'ix_orders_product_id': ('orders', ('product_id',)),
+        'ix_orders_status_created_at': ('orders', ('status', 'created_at')),
+        'ix_products_category': ('products', ('category',)),
+    }
+}
+
+def create_indexes(session: SQLASession, profile: str):
+    """Build the indexes of a schema profile and refresh the planner statistics"""
+    indexes = SCHEMA_PROFILES[profile]
+    if not indexes:
+        return
+    start = time.perf_counter()
+    for name, (table, columns) in indexes.items():
+        session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+    session.execute(text('ANALYZE'))
+    session.commit()
+    logger.info(f"Built {len(indexes)} indexes of schema profile {profile} in {time.perf_counter() - start:.2f}s")
+
+def drop_indexes(session: SQLASession, profile: str):
+    """Drop the indexes of a schema profile ahead of a bulk load"""
+    for name in SCHEMA_PROFILES[profile]:
+        session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    session.commit()
+
+# Loads pick their ids as max(id) + 1, so only one generate_data run loads a given database at a time
+_load_locks: Dict[str, threading.Lock] = {}
+_load_locks_guard = threading.Lock()
+
+def database_lock(session: SQLASession) -> threading.Lock:
+    """Lock held while generate_data loads the database the session is bound to"""
+    url = session.get_bind().url.render_as_string(hide_password=False)
+    with _load_locks_guard:
+        return _load_locks.setdefault(url, threading.Lock())
+
 Base.metadata.create_all(engine)
 Session = sessionmaker(bind=engine)
 session = Session()
 
 class DataGenerator:
-    def __init__(self, locale: str = 'en_US', use_ml: bool = False):
+    def __init__(self, locale: str = 'en_US', use_ml: bool = False, engine: Optional[Engine] = None,
+                 value_pool_size: Optional[int] = None, value_pool_dir: Optional[str] = None,
+                 unique_emails: bool = False, seed: Optional[int] = None,
+                 model_cache_dir: Optional[str] = ML_MODEL_CACHE_DIR,
+                 sequence_epochs: Optional[int] = None, sequence_time_budget: Optional[float] = None,
+                 validate: bool = False, schema_profile: Optional[str] = None,
+                 reference_date: Optional[date] = None):
+        if schema_profile is not None and schema_profile not in SCHEMA_PROFILES:
+            raise ValueError(f"Unknown schema profile: {schema_profile}")
+        self.locale = locale
         self.fake = Faker(locale)
-        self.session = Session()
+        # Base seed of the run; chunked generation derives one seed per chunk from it with chunk_seed
+        self.seed = seed
+        # Ages are measured on this date rather than today; together with the seed it fixes the generated rows
+        if reference_date is None:
+            reference_date = SEED_REFERENCE_DATE if seed is not None else date.today()
+        self.reference_date = reference_date
+        self.session = Session(bind=engine) if engine is not None else Session()
         self.use_ml = use_ml
+        # Product id -> price, so orders never query the database for prices
+        self.product_prices: Dict[int, float] = {}
+        self.vectorized = VectorizedBackend()
+        # Called as progress(entity, rows) while generate_data runs; may raise to abort generation
+        self.progress: Optional[Callable[[str, int], None]] = None
+        # With a validator, generated rows are constrained to the validation rules and rejected rows redrawn
+        self.validator: Optional[Validator] = Validator() if validate else None
+        # Optional pre-generated text values that replace per-row Faker provider calls
+        self.value_pool: Optional[ValuePool] = None
+        if value_pool_size:
+            # Pooled emails are moved onto the allowed domains up front, which keeps unique emails distinct
+            email_domains = self.validator.rules.email_domains if self.validator is not None else None
+            self.value_pool = ValuePool(locale, value_pool_size, value_pool_dir, unique_emails, seed, email_domains)
+        if seed is not None:
+            self.reseed(seed)
+        self.validation_stats: Dict[str, ValidationStats] = {}
+        self.model_cache_dir = model_cache_dir
+        # Training budget of the order sequence model; None keeps the ml_generator defaults
+        self.sequence_epochs = sequence_epochs
+        self.sequence_time_budget = sequence_time_budget
+        # Indexes built once generate_data has loaded the database; None leaves the schema alone
+        self.schema_profile = schema_profile
         if use_ml:
+            # The ML stack is heavy to import, so it is only loaded once ML generation is requested
+            from ml_generator import MLDataGenerator
             self.ml_generator = MLDataGenerator()
             # Train ML models with existing data if available
             self._train_ml_models()
 
+    def reseed(self, seed: int):
+        """Seed every random source used for row generation"""
+        self.fake.seed_instance(seed)
+        self.vectorized = VectorizedBackend(seed)
+        if self.value_pool is not None:
+            self.value_pool.seed(seed)
+
+    def use_session(self, session: Optional[SQLASession]):
+        """Switch to another session, dropping state cached from the previous one"""
+        self.session = session
+        self.product_prices.clear()
+
     def _train_ml_models(self):
-        """Train ML models with existing data"""
+        """Load ML models cached for the current users and orders, training them only when those tables changed"""
+        from ml_generator import SEQUENCE_MAX_WINDOWS, SEQUENCE_WINDOW
         try:
-            # Get historical data
-            users = [user.__dict__ for user in self.session.query(User).all()]
-            if users:
-                self.ml_generator.train_user_pattern_model(users)
-                logger.info("ML models trained successfully")
+            user_count, max_user_id = self.session.query(func.count(User.id), func.max(User.id)).one()
+            order_count, max_order_id = self.session.query(func.count(Order.id), func.max(Order.id)).one()
+            if not user_count and not order_count:
+                return
+            fingerprint = (f"{self.session.get_bind().url}:users:{user_count}:{max_user_id}"
+                           f":orders:{order_count}:{max_order_id}")
+            if self.model_cache_dir:
+                start = time.perf_counter()
+                if self.ml_generator.load_models(self.model_cache_dir, fingerprint):
+                    logger.info(f"Loaded cached ML models in {time.perf_counter() - start:.2f}s")
+                    return
+
+            trained = False
+            if user_count:
+                # Get historical data
+                start = time.perf_counter()
+                users = [dict(row._mapping) for row in self.session.execute(select(*User.__table__.columns))]
+                if self.ml_generator.train_user_pattern_model(users):
+                    logger.info(f"ML models trained successfully on {user_count} users "
+                                f"in {time.perf_counter() - start:.2f}s")
+                    trained = True
+            if order_count > SEQUENCE_WINDOW:
+                # Only the most recent orders are read, as many as the training budget can use
+                recent = (select(Order.created_at, Order.total_price).order_by(Order.id.desc())
+                          .limit(SEQUENCE_MAX_WINDOWS + SEQUENCE_WINDOW))
+                orders = [dict(row._mapping) for row in self.session.execute(recent)]
+                budget = {'epochs': self.sequence_epochs, 'time_budget': self.sequence_time_budget}
+                if self.ml_generator.train_sequence_model(
+                        orders, seed=self.seed, **{key: value for key, value in budget.items() if value is not None}):
+                    trained = True
+            if trained and self.model_cache_dir:
+                self.ml_generator.save_models(self.model_cache_dir, fingerprint)
         except Exception as e:
             logger.error(f"Error training ML models: {str(e)}")
 
+    def _user_row(self, columns: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        pool = self.value_pool
+        if pool is not None:
+            row = {
+                'name': pool.sample('name'),
+                'email': pool.email(),
+                'address': pool.sample('address'),
+                'phone': pool.sample('phone')
+            }
+        else:
+            row = {
+                'name': self.fake.name(),
+                'email': self.fake.email(),
+                'address': self.fake.address().replace('\n', ', '),
+                'phone': self.fake.phone_number()
+            }
+        if self.validator is not None:
+            self._constrain_user(row)
+        else:
+            row['birth_date'] = self._birth_date(MIN_AGE, MAX_AGE)
+        # Columns drawn by the vectorized backend replace the per-row Faker draws
+        row.update(columns or {'is_active': self.fake.boolean()})
+        row['created_at'] = datetime.now(timezone.utc)
+        return row
+
+    def _birth_date(self, minimum_age: int, maximum_age: int) -> date:
+        """Birth date of someone minimum_age to maximum_age years old on the reference date, from the seeded Faker"""
+        latest = _years_before(self.reference_date, minimum_age)
+        earliest = _years_before(self.reference_date, maximum_age + 1) + timedelta(days=1)
+        return date.fromordinal(self.fake.random.randint(earliest.toordinal(), latest.toordinal()))
+
+    def _constrain_user(self, row: Dict[str, Any]):
+        """Draw the user fields the validator checks inside its rules instead of rejecting them afterwards"""
+        rules = self.validator.rules
+        row['birth_date'] = self._birth_date(rules.min_age, rules.max_age)
+        row['email'] = self._allowed_email(row['email'])
+        phone_format = rules.phone_formats.get(self.locale)
+        if phone_format:
+            row['phone'] = self.fake.numerify(phone_format)
+
+    def _allowed_email(self, email: str) -> str:
+        domains = self.validator.rules.email_domains
+        local, domain = email.split('@', 1)
+        if not domains or domain in domains:
+            return email
+        return f"{local}@{self.fake.random_element(elements=sorted(domains))}"
+
+    def _validated(self, entity: str, rows: List[Dict[str, Any]],
+                   regenerate: Callable[[int], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Replace the rows of a block that fail validation, redrawing all failures of a round in one batch"""
+        if self.validator is None:
+            return rows
+        stats = self.validation_stats.setdefault(entity, ValidationStats())
+        stats.generated += len(rows)
+        invalid = np.flatnonzero(self._validation_masks(entity, rows))
+        start = time.perf_counter()
+        rounds = 0
+        while len(invalid):
+            if rounds == MAX_REJECTION_ROUNDS:
+                raise ValueError(f"{len(invalid)} {entity} still fail validation after {rounds} rounds of regeneration")
+            rounds += 1
+            replacements = regenerate(len(invalid))
+            stats.generated += len(replacements)
+            stats.regenerated += len(replacements)
+            for index, row in zip(invalid.tolist(), replacements):
+                rows[index] = row
+            invalid = invalid[self._validation_masks(entity, replacements) != 0]
+        if rounds:
+            stats.regeneration_seconds += time.perf_counter() - start
+        stats.accepted += len(rows)
+        return rows
+
+    def _validation_masks(self, entity: str, rows: List[Dict[str, Any]]) -> np.ndarray:
+        if entity == 'users':
+            # Ages are checked on the date they were drawn for, so seeded runs validate the same way on any day
+            return self.validator.validate_users(rows, self.locale, self.reference_date)
+        if entity == 'products':
+            return self.validator.validate_products(rows)
+        return self.validator.validate_orders(rows)
+
+    def _log_validation_stats(self):
+        for entity, stats in self.validation_stats.items():
+            logger.info(f"Validation of {entity}: {stats.acceptance_rate:.1%} accepted, {stats.regenerated} rows "
+                        f"regenerated in {stats.regeneration_seconds:.2f}s")
+
+    def _product_row(self, columns: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        pool = self.value_pool
+        if pool is not None:
+            row = {
+                'name': pool.sample('word'),
+                'description': pool.sample('text'),
+                'category': pool.sample('word')
+            }
+        else:
+            row = {
+                'name': self.fake.word(),
+                'description': self.fake.text(),
+                'category': self.fake.word()
+            }
+        row.update(columns or {
+            'price': self.fake.pyfloat(left_digits=2, right_digits=2, positive=True),
+            'stock_quantity': self.fake.random_int(min=0, max=1000)
+        })
+        row['created_at'] = datetime.now(timezone.utc)
+        return row
+
+    def _order_row(self, user_id: int, product_id: int, price: float) -> Dict[str, Any]:
+        quantity = self.fake.random_int(min=1, max=10)
+        return {
+            'user_id': user_id,
+            'product_id': product_id,
+            'quantity': quantity,
+            'total_price': quantity * price,
+            'status': self.fake.random_element(elements=ORDER_STATUSES),
+            'created_at': datetime.now(timezone.utc)
+        }
+
     def generate_user(self) -> User:
-        base_user = User(
-            name=self.fake.name(),
-            email=self.fake.email(),
-            address=self.fake.address().replace('\n', ', '),
-            phone=self.fake.phone_number(),
-            birth_date=self.fake.date_of_birth(),
-            is_active=self.fake.boolean(),
-            created_at=datetime.now(timezone.utc)
-        )
-        
-        if self.use_ml and hasattr(self, 'ml_generator'):
-            try:
-                enhanced_user = self.ml_generator.generate_smart_user(base_user.__dict__)
-                return User(**enhanced_user)
-            except Exception as e:
-                logger.error(f"Error generating smart user: {str(e)}")
-                return base_user
-        return base_user
+        # The model sees the plain row; ORM objects carry SQLAlchemy state that is not a User column
+        return User(**self._smart_users([self._user_row()])[0])
 
     def generate_product(self) -> Product:
-        return Product(
-            name=self.fake.word(),
-            description=self.fake.text(),
-            price=self.fake.pyfloat(left_digits=2, right_digits=2, positive=True),
-            category=self.fake.word(),
-            stock_quantity=self.fake.random_int(min=0, max=1000),
-            created_at=datetime.now(timezone.utc)
-        )
+        return Product(**self._product_row())
 
     def generate_order(self, user_id: int, product_id: int) -> Order:
-        quantity = self.fake.random_int(min=1, max=10)
-        price = self.session.query(Product).filter_by(id=product_id).first().price
-        return Order(
-            user_id=user_id,
-            product_id=product_id,
-            quantity=quantity,
-            total_price=quantity * price,
-            status=self.fake.random_element(elements=('pending', 'completed', 'cancelled')),
-            created_at=datetime.now(timezone.utc)
-        )
-
-    def generate_data(self, num_users: int = 10, num_products: int = 20, num_orders: int = 50):
+        return Order(**self._order_row(user_id, product_id, self._product_price(product_id)))
+
+    def _product_price(self, product_id: int) -> float:
+        price = self.product_prices.get(product_id)
+        if price is None:
+            self._load_product_prices()
+            price = self.product_prices[product_id]
+        return price
+
+    def _load_product_prices(self):
+        """Populate the price index from the database in a single query"""
+        self.product_prices.update(self.session.query(Product.id, Product.price).all())
+
+    def generate_data(self, num_users: int = 10, num_products: int = 20, num_orders: int = 50,
+                      bulk: bool = False, chunk_size: Optional[int] = None, workers: int = 1,
+                      output_format: Optional[str] = None, output_dir: str = '.'):
         logger.info(f"Generating {num_users} users, {num_products} products, and {num_orders} orders")
-        
-        # Generate users
-        users = [self.generate_user() for _ in range(num_users)]
+        self.validation_stats.clear()
+        # File output needs no lock: every run writes its own files with ids from 1
+        with nullcontext() if output_format else database_lock(self.session):
+            schema_profile = None if output_format else self.schema_profile
+            if schema_profile:
+                # Loading unindexed tables and indexing them once afterwards beats maintaining indexes per insert
+                drop_indexes(self.session, schema_profile)
+            try:
+                self._load_data(num_users, num_products, num_orders, bulk, chunk_size, workers,
+                                output_format, output_dir)
+            finally:
+                if schema_profile:
+                    # Failed and cancelled loads get the profile's indexes back as well
+                    self.session.rollback()
+                    create_indexes(self.session, schema_profile)
+        self._log_validation_stats()
+
+    def _load_data(self, num_users: int, num_products: int, num_orders: int, bulk: bool,
+                   chunk_size: Optional[int], workers: int, output_format: Optional[str], output_dir: str):
+        """Generate the rows and write them along the path selected by generate_data's arguments"""
+        if output_format or workers > 1 or bulk:
+            # Rows skip the ORM and go to a sink: export files if requested, otherwise the backend's bulk-load path
+            sink = FileSink(output_format, output_dir) if output_format else database_sink(self.session)
+            batch_size = chunk_size or BULK_BATCH_SIZE
+            try:
+                if workers > 1:
+                    self._generate_data_parallel(num_users, num_products, num_orders, workers, batch_size, sink)
+                else:
+                    self._generate_data_bulk(num_users, num_products, num_orders, batch_size, sink)
+            except BaseException:
+                # Failed or cancelled runs still release the sink's files and transaction
+                sink.abort()
+                raise
+            sink.close()
+            return
+        if chunk_size:
+            self._generate_data_streaming(num_users, num_products, num_orders, chunk_size)
+        else:
+            self._generate_data_orm(num_users, num_products, num_orders)
+        # Ids are assigned in-process here as well, so later inserts without one must not reuse them
+        advance_id_sequences(self.session, EXPORT_TABLES.values())
+        self.session.commit()
+
+    def _generate_data_orm(self, num_users: int, num_products: int, num_orders: int):
+        """Generate rows in blocks (vectorized from VECTORIZE_MIN_BATCH rows) and add them through the ORM"""
+        first_user_id = self._next_id(User)
+        users = [User(**row) for row in self._report('users', self._user_rows(num_users, first_user_id))]
         self.session.add_all(users)
         self.session.commit()
         logger.info(f"Generated {len(users)} users")
 
-        # Generate products
-        products = [self.generate_product() for _ in range(num_products)]
+        first_product_id = self._next_id(Product)
+        products = [Product(**row) for row in self._report('products', self._product_rows(num_products, first_product_id))]
         self.session.add_all(products)
         self.session.commit()
         logger.info(f"Generated {len(products)} products")
 
-        # Generate orders
-        orders = []
-        for _ in range(num_orders):
-            user_id = self.fake.random_element(elements=[u.id for u in users])
-            product_id = self.fake.random_element(elements=[p.id for p in products])
-            orders.append(self.generate_order(user_id, product_id))
-        
+        # Orders reference the contiguous id ranges of the users and products just added
+        orders = [Order(**row) for row in self._report('orders', self._order_rows(
+            num_orders, self._next_id(Order), first_user_id, num_users, first_product_id, num_products))]
         self.session.add_all(orders)
         self.session.commit()
         logger.info(f"Generated {len(orders)} orders")
 
-    def export_data(self, format: str = 'json'):
+    def _generate_data_streaming(self, num_users: int, num_products: int, num_orders: int, chunk_size: int):
+        """Generate ORM objects lazily and commit them one chunk at a time"""
+        # Ids are assigned in-process so orders only need the id ranges, not the user/product objects
+        seed = self._run_seed()
+        first_user_id = self._next_id(User)
+        users = (User(**row) for row in self._seeded_rows(seed, 'users', num_users, chunk_size, first_user_id))
+        self._commit_in_chunks(self._report('users', users), chunk_size)
+        logger.info(f"Generated {num_users} users")
+
+        first_product_id = self._next_id(Product)
+        products = (Product(**row)
+                    for row in self._seeded_rows(seed, 'products', num_products, chunk_size, first_product_id))
+        self._commit_in_chunks(self._report('products', products), chunk_size)
+        logger.info(f"Generated {num_products} products")
+
+        orders = (Order(**row) for row in self._seeded_rows(seed, 'orders', num_orders, chunk_size,
+                                                            self._next_id(Order), first_user_id, num_users,
+                                                            first_product_id, num_products))
+        self._commit_in_chunks(self._report('orders', orders), chunk_size)
+        logger.info(f"Generated {num_orders} orders")
+
+    def _report(self, entity: str, items: Iterable) -> Iterator:
+        """Pass items through, reporting every PROGRESS_INTERVAL of them to the progress callback"""
+        if self.progress is None:
+            yield from items
+            return
+        pending = 0
+        for item in items:
+            yield item
+            pending += 1
+            if pending == PROGRESS_INTERVAL:
+                self.progress(entity, pending)
+                pending = 0
+        if pending:
+            self.progress(entity, pending)
+
+    def _commit_in_chunks(self, objects: Iterable[Base], chunk_size: int):
+        for chunk in chunked(objects, chunk_size):
+            self.session.add_all(chunk)
+            self.session.commit()
+            # Drop committed objects so the identity map does not grow with the row count
+            self.session.expunge_all()
+
+    def _generate_data_bulk(self, num_users: int, num_products: int, num_orders: int, batch_size: int, sink):
+        """Generate plain rows and write them to the sink in batches"""
+        sink.prepare()
+        seed = self._run_seed()
+
+        # Ids are assigned in-process so orders can reference new rows without reading them back
+        first_user_id = sink.next_id(User.__table__)
+        users = self._seeded_rows(seed, 'users', num_users, batch_size, first_user_id)
+        sink.write(User.__table__, self._report('users', users), batch_size)
+        logger.info(f"Generated {num_users} users")
+
+        first_product_id = sink.next_id(Product.__table__)
+        products = self._seeded_rows(seed, 'products', num_products, batch_size, first_product_id)
+        sink.write(Product.__table__, self._report('products', products), batch_size)
+        logger.info(f"Generated {num_products} products")
+
+        orders = self._seeded_rows(seed, 'orders', num_orders, batch_size, sink.next_id(Order.__table__),
+                                   first_user_id, num_users, first_product_id, num_products)
+        sink.write(Order.__table__, self._report('orders', orders), batch_size)
+        logger.info(f"Generated {num_orders} orders")
+
+    def _generate_data_parallel(self, num_users: int, num_products: int, num_orders: int,
+                                workers: int, batch_size: int, sink):
+        """Generate row shards in a process pool and write them to the sink from this process"""
+        sink.prepare()
+        base_seed = self._run_seed()
+        validate = self.validator is not None
+        # Workers reuse the models trained or loaded here instead of training their own
+        ml_models = self.ml_generator.models if self.use_ml and hasattr(self, 'ml_generator') else None
+
+        # Every shard gets a fixed id range up front, so workers never collide on ids
+        first_user_id = sink.next_id(User.__table__)
+        first_product_id = sink.next_id(Product.__table__)
+        first_order_id = sink.next_id(Order.__table__)
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(self.locale, ml_models, {}, self.value_pool, validate, self.reference_date)) as pool:
+            users = _run_shards(pool, workers, base_seed, 'users', num_users, batch_size, first_user_id,
+                                validation_stats=self.validation_stats)
+            sink.write(User.__table__, self._report('users', users), batch_size)
+            logger.info(f"Generated {num_users} users")
+
+            products = _run_shards(pool, workers, base_seed, 'products', num_products, batch_size, first_product_id,
+                                   validation_stats=self.validation_stats)
+            sink.write(Product.__table__, self._report('products', self._index_prices(products)), batch_size)
+            logger.info(f"Generated {num_products} products")
+
+        # Order workers need the global id ranges and the prices of the new products, also as one array
+        prices = price_array(self.product_prices, first_product_id, num_products)
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(self.locale, ml_models, self.product_prices, None, validate,
+                                           self.reference_date, prices)) as pool:
+            orders = _run_shards(pool, workers, base_seed, 'orders', num_orders, batch_size, first_order_id,
+                                 first_user_id, num_users, first_product_id, num_products,
+                                 validation_stats=self.validation_stats)
+            sink.write(Order.__table__, self._report('orders', orders), batch_size)
+        logger.info(f"Generated {num_orders} orders")
+
+    def _run_seed(self) -> int:
+        """The base seed for one chunked run, logged so an unseeded run can be reproduced"""
+        seed = self.seed if self.seed is not None else random.getrandbits(32)
+        logger.info(f"Generating with seed {seed} and reference date {self.reference_date.isoformat()}")
+        return seed
+
+    def _chunk_rows(self, entity: str, seed: int, first_id: int, count: int, *order_ranges: int,
+                    prices: Optional[np.ndarray] = None) -> Iterator[Dict[str, Any]]:
+        """Rows of one chunk, which depend only on the chunk's seed, ids and the product prices"""
+        self.reseed(seed)
+        if entity == 'users':
+            return self._user_rows(count, first_id)
+        if entity == 'products':
+            return self._product_rows(count, first_id)
+        return self._order_rows(count, first_id, *order_ranges, prices=prices)
+
+    def _seeded_rows(self, base_seed: int, entity: str, count: int, chunk_size: int, first_id: int,
+                     *order_ranges: int) -> Iterator[Dict[str, Any]]:
+        """Rows of a whole table, generated chunk by chunk from seeds derived with chunk_seed"""
+        # Order chunks share one price array of the product range instead of rebuilding it per chunk
+        prices = price_array(self.product_prices, *order_ranges[2:]) if entity == 'orders' and count else None
+        for index, start in enumerate(range(0, count, chunk_size)):
+            yield from self._chunk_rows(entity, chunk_seed(base_seed, entity, index), first_id + start,
+                                        min(chunk_size, count - start), *order_ranges, prices=prices)
+
+    def regenerate_chunk(self, entity: str, index: int, num_users: int, num_products: int, num_orders: int,
+                         chunk_size: int = BULK_BATCH_SIZE, first_user_id: int = 1, first_product_id: int = 1,
+                         first_order_id: int = 1) -> List[Dict[str, Any]]:
+        """Rebuild chunk index of one table exactly as a chunked run with the same seed and reference date produced it"""
+        if self.seed is None:
+            raise ValueError("Regenerating a chunk requires the generator's seed")
+        counts = {'users': num_users, 'products': num_products, 'orders': num_orders}
+        start = index * chunk_size
+        if entity not in counts or not 0 <= start < counts[entity]:
+            raise ValueError(f"No chunk {index} of {entity} with chunk size {chunk_size}")
+        size = min(chunk_size, counts[entity] - start)
+        if entity == 'users':
+            return list(self._chunk_rows(entity, chunk_seed(self.seed, entity, index), first_user_id + start, size))
+        if entity == 'products':
+            return list(self._chunk_rows(entity, chunk_seed(self.seed, entity, index), first_product_id + start, size))
+        # Orders price their products, so the product chunks are regenerated first for their prices
+        for _ in self._seeded_rows(self.seed, 'products', num_products, chunk_size, first_product_id):
+            pass
+        return list(self._chunk_rows(entity, chunk_seed(self.seed, entity, index), first_order_id + start, size,
+                                     first_user_id, num_users, first_product_id, num_products))
+
+    def _user_rows(self, count: int, first_id: int) -> Iterator[Dict[str, Any]]:
+        next_id = first_id
+        for size in blocks(count):
+            if size < VECTORIZE_MIN_BATCH:
+                rows = [self._user_row() for _ in range(size)]
+            else:
+                rows = [self._user_row(columns) for columns in iter_rows(self.vectorized.user_columns(size))]
+            rows = self._validated('users', rows, lambda count: [self._user_row() for _ in range(count)])
+            for row in self._smart_users(rows):
+                if self.value_pool is not None and self.value_pool.unique_emails:
+                    # Keyed by id so parallel shards produce globally distinct emails
+                    row['email'] = self.value_pool.email(next_id)
+                row['id'] = next_id
+                next_id += 1
+                yield row
+
+    def _smart_users(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply the ML user model to a block of rows with one batched prediction"""
+        if self.use_ml and hasattr(self, 'ml_generator'):
+            return self.ml_generator.generate_smart_users(rows)
+        return rows
+
+    def _product_rows(self, count: int, first_id: int) -> Iterator[Dict[str, Any]]:
+        next_id = first_id
+        for size in blocks(count):
+            if size < VECTORIZE_MIN_BATCH:
+                rows = [self._product_row() for _ in range(size)]
+            else:
+                rows = [self._product_row(columns) for columns in iter_rows(self.vectorized.product_columns(size))]
+            for row in self._validated('products', rows, lambda count: [self._product_row() for _ in range(count)]):
+                row['id'] = next_id
+                next_id += 1
+                self.product_prices[row['id']] = row['price']
+                yield row
+
+    def _index_prices(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for row in rows:
+            self.product_prices[row['id']] = row['price']
+            yield row
+
+    def _order_rows(self, count: int, first_id: int, first_user_id: int, num_users: int,
+                    first_product_id: int, num_products: int,
+                    prices: Optional[np.ndarray] = None) -> Iterator[Dict[str, Any]]:
+        next_id = first_id
+        for size in blocks(count):
+            if size < VECTORIZE_MIN_BATCH:
+                rows = (self._random_order_row(first_user_id, num_users, first_product_id, num_products)
+                        for _ in range(size))
+            else:
+                if prices is None:
+                    prices = price_array(self.product_prices, first_product_id, num_products)
+                columns = self.vectorized.order_columns(size, first_user_id, num_users, first_product_id, prices)
+                rows = iter_rows(columns)
+            rows = self._sequence_orders(list(rows))
+            rows = self._validated('orders', rows, lambda count: self._sequence_orders([
+                self._random_order_row(first_user_id, num_users, first_product_id, num_products) for _ in range(count)
+            ]))
+            for row in rows:
+                row['id'] = next_id
+                row.setdefault('created_at', datetime.now(timezone.utc))
+                next_id += 1
+                yield row
+
+    def _sequence_orders(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Give a block of orders created_at and total_price sampled from the ML sequence model, if trained"""
+        if not (self.use_ml and hasattr(self, 'ml_generator') and 'sequence' in self.ml_generator.models):
+            return rows
+        created_at, totals = self.ml_generator.sample_order_sequences(len(rows), self.vectorized.rng)
+        for row, created, total in zip(rows, created_at, totals.tolist()):
+            price = self.product_prices[row['product_id']]
+            # The sampled total picks the quantity, so total_price stays quantity * price
+            quantity = min(max(round(total / price), 1), 10)
+            row.update(quantity=quantity, total_price=quantity * price, created_at=created)
+        return rows
+
+    def stream_rows(self, entity: str, count: int, num_users: int, num_products: int) -> Iterator[Dict[str, Any]]:
+        """Lazily generate rows of one entity without persisting anything, ids starting at 1"""
+        seed = self._run_seed()
+        if entity != 'orders':
+            return self._seeded_rows(seed, entity, count, BULK_BATCH_SIZE, 1)
+        # Orders reference a catalogue of num_products products whose prices are drawn first
+        self.product_prices.clear()
+        for _ in self._seeded_rows(seed, 'products', num_products, BULK_BATCH_SIZE, 1):
+            pass
+        return self._seeded_rows(seed, 'orders', count, BULK_BATCH_SIZE, 1, 1, num_users, 1, num_products)
+
+    def _random_order_row(self, first_user_id: int, num_users: int,
+                          first_product_id: int, num_products: int) -> Dict[str, Any]:
+        user_id = self.fake.random_int(min=first_user_id, max=first_user_id + num_users - 1)
+        product_id = self.fake.random_int(min=first_product_id, max=first_product_id + num_products - 1)
+        return self._order_row(user_id, product_id, self.product_prices[product_id])
+
+    def _next_id(self, model) -> int:
+        return (self.session.query(func.max(model.id)).scalar() or 0) + 1
+
+    def export_data(self, format: str = 'json', output_dir: str = '.', batch_size: int = EXPORT_BATCH_SIZE,
+                    compression: Optional[str] = None, row_group_size: Optional[int] = None,
+                    workers: int = 1, part_rows: Optional[int] = None) -> List[str]:
         """Export data to various formats"""
-        data = {
-            'users': [user.__dict__ for user in self.session.query(User).all()],
-            'products': [product.__dict__ for product in self.session.query(Product).all()],
-            'orders': [order.__dict__ for order in self.session.query(Order).all()]
-        }
+        if workers > 1 or part_rows:
+            # Tables and table parts are written concurrently, with a manifest.json alongside them
+            manifest = export_tables_parallel(self.session, EXPORT_TABLES, format, output_dir, batch_size,
+                                              compression, row_group_size, max(workers, 1), part_rows)
+            return [os.path.join(output_dir, entry['path']) for entry in manifest['files']]
+        return export_tables(self.session, EXPORT_TABLES, format, output_dir, batch_size,
+                             compression, row_group_size)
+
+# Per-process generator used by the parallel generation workers, and the prices of the order workers' products
+_worker_generator: Optional[DataGenerator] = None
+_worker_prices: Optional[np.ndarray] = None
+
+
+def _init_worker(locale: str, ml_models: Optional[Dict[str, Any]], product_prices: Dict[int, float],
+                 value_pool: Optional[ValuePool], validate: bool = False, reference_date: Optional[date] = None,
+                 prices: Optional[np.ndarray] = None):
+    global _worker_generator, _worker_prices
+    # Pooled connections inherited from the parent process must not be reused here
+    engine.dispose(close=False)
+    _worker_generator = DataGenerator(locale=locale, validate=validate, reference_date=reference_date)
+    _worker_generator.product_prices = product_prices
+    _worker_generator.value_pool = value_pool
+    _worker_prices = prices
+    if ml_models:
+        # The parent's trained models, so workers neither train nor touch the model cache
+        from ml_generator import MLDataGenerator
+        _worker_generator.ml_generator = MLDataGenerator()
+        _worker_generator.ml_generator.models = ml_models
+        _worker_generator.use_ml = True
+
+
+def _generate_shard(entity: str, seed: int, first_id: int, count: int,
+                    *order_ranges: int) -> Tuple[List[Dict[str, Any]], Optional[ValidationStats]]:
+    """Generate one shard of rows inside a worker process, with its validation stats"""
+    _worker_generator.validation_stats.clear()
+    rows = list(_worker_generator._chunk_rows(entity, seed, first_id, count, *order_ranges, prices=_worker_prices))
+    return rows, _worker_generator.validation_stats.get(entity)
+
+
+def _years_before(day: date, years: int) -> date:
+    # 29 February falls back to the 28th in years without it
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def chunk_seed(base_seed: int, entity: str, index: int) -> int:
+    """Seed of chunk index of a table, derived so any chunk can be regenerated on its own"""
+    return random.Random(f'{base_seed}:{entity}:{index}').getrandbits(32)
+
+
+def _run_shards(pool: ProcessPoolExecutor, workers: int, base_seed: int, entity: str, count: int,
+                shard_size: int, first_id: int, *order_ranges: int,
+                validation_stats: Optional[Dict[str, ValidationStats]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield rows from shards generated in the pool, in id order, adding up their validation stats"""
+    def rows_of(future) -> List[Dict[str, Any]]:
+        rows, stats = future.result()
+        if stats is not None and validation_stats is not None:
+            validation_stats.setdefault(entity, ValidationStats()).merge(stats)
+        return rows
+
+    # Only a couple of shards per worker are in flight so memory stays bounded
+    pending = deque()
+    for index, start in enumerate(range(0, count, shard_size)):
+        seed = chunk_seed(base_seed, entity, index)
+        pending.append(pool.submit(_generate_shard, entity, seed, first_id + start,
+                                   min(shard_size, count - start), *order_ranges))
+        if len(pending) >= workers * 2:
+            yield from rows_of(pending.popleft())
+    while pending:
+        yield from rows_of(pending.popleft())
 
-        if format == 'json':
-            with open('exported_data.json', 'w') as f:
-                json.dump(data, f, default=str)
-        elif format == 'csv':
-            for table_name, records in data.items():
-                with open(f'{table_name}.csv', 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=records[0].keys())
-                    writer.writeheader()
-                    writer.writerows(records)
-        elif format == 'yaml':
-            with open('exported_data.yaml', 'w') as f:
-                yaml.dump(data, f, default_flow_style=False)
 
 def main():
     parser = argparse.ArgumentParser(description='Advanced Data Generator')
@@ -182,16 +772,52 @@ def main():
     parser.add_argument('--products', type=int, default=20, help='Number of products to generate')
     parser.add_argument('--orders', type=int, default=50, help='Number of orders to generate')
     parser.add_argument('--locale', type=str, default='en_US', help='Locale for data generation')
-    parser.add_argument('--export', type=str, choices=['json', 'csv', 'yaml'], help='Export format')
+    parser.add_argument('--export', type=str, choices=EXPORT_FORMATS, help='Export format')
+    parser.add_argument('--output-format', type=str, choices=FILE_SINK_FORMATS,
+                        help='Write generated rows straight to files in this format, skipping the database')
+    parser.add_argument('--output-dir', type=str, default='.', help='Directory for --output-format files')
+    parser.add_argument('--compression', type=str,
+                        help='Compression for exports: gzip/zstd for text formats, a codec such as zstd for parquet/feather')
+    parser.add_argument('--row-group-size', type=int, help='Rows per Parquet row group')
+    parser.add_argument('--export-workers', type=int, default=1, help='Processes writing export tables concurrently')
+    parser.add_argument('--part-rows', type=int, help='Split exported tables into part files of about this many rows')
     parser.add_argument('--use-ml', action='store_true', help='Use ML-enhanced data generation')
+    parser.add_argument('--bulk', action='store_true', help='Write rows with batched Core inserts instead of the ORM')
+    parser.add_argument('--chunk-size', type=int, help='Stream rows and commit them in batches of this size')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes generating rows')
+    parser.add_argument('--value-pool-size', type=int, help='Sample text fields from pools of this many pre-generated values')
+    parser.add_argument('--value-pool-dir', type=str, help='Directory where value pools are cached per locale')
+    parser.add_argument('--unique-emails', action='store_true', help='Guarantee distinct emails when using value pools')
+    parser.add_argument('--model-cache-dir', type=str, default=ML_MODEL_CACHE_DIR,
+                        help='Directory where trained ML models are cached between runs')
+    parser.add_argument('--sequence-epochs', type=int, help='Epochs for the ML order sequence model')
+    parser.add_argument('--sequence-time-budget', type=float,
+                        help='Seconds after which ML order sequence model training stops')
+    parser.add_argument('--validate', action='store_true',
+                        help='Only write rows that pass the validation rules in config.yaml')
+    parser.add_argument('--schema-profile', type=str, choices=list(SCHEMA_PROFILES),
+                        help='Indexes to drop before loading the rows and build once they are loaded')
+    parser.add_argument('--seed', type=int, help='Base seed; with --bulk, --chunk-size or --workers every chunk is reproducible')
+    parser.add_argument('--reference-date', type=date.fromisoformat,
+                        help='Date user ages are measured on (YYYY-MM-DD); defaults to today, or a fixed date with --seed')
     
     args = parser.parse_args()
+    if args.seed is not None:
+        fake.seed_instance(args.seed)
     
-    generator = DataGenerator(locale=args.locale, use_ml=args.use_ml)
-    generator.generate_data(args.users, args.products, args.orders)
+    generator = DataGenerator(locale=args.locale, use_ml=args.use_ml,
+                              value_pool_size=args.value_pool_size, value_pool_dir=args.value_pool_dir,
+                              unique_emails=args.unique_emails, seed=args.seed,
+                              model_cache_dir=args.model_cache_dir, sequence_epochs=args.sequence_epochs,
+                              sequence_time_budget=args.sequence_time_budget, validate=args.validate,
+                              schema_profile=args.schema_profile, reference_date=args.reference_date)
+    generator.generate_data(args.users, args.products, args.orders,
+                             bulk=args.bulk, chunk_size=args.chunk_size, workers=args.workers,
+                             output_format=args.output_format, output_dir=args.output_dir)
     
     if args.export:
-        generator.export_data(args.export)
+        generator.export_data(args.export, compression=args.compression, row_group_size=args.row_group_size,
+                              workers=args.export_workers, part_rows=args.part_rows)
         logger.info(f"Data exported to {args.export} format")
 
 if __name__ == '__main__':
@@ -1,38 +1,112 @@
+# scikit-learn, SciPy, TensorFlow and joblib are imported where they are used, so that importing
+# this module (and main) stays cheap when no ML feature runs
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, LSTM
-import joblib
+import json
 import logging
-from datetime import datetime
+import os
+import re
+import time
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Width of the hashed feature space, fixed however many distinct values the data holds
+HASHING_FEATURES = 2 ** 10
+
+# Orders per input window of the sequence model, and the features of each order in it
+SEQUENCE_WINDOW = 16
+SEQUENCE_FEATURES = 2
+
+# Sequence model size and its default CPU training budget
+SEQUENCE_UNITS = 32
+SEQUENCE_EPOCHS = 10
+SEQUENCE_MAX_WINDOWS = 50000
+SEQUENCE_BATCH_SIZE = 256
+
+# Order streams sampled side by side, so one model call produces this many orders
+SEQUENCE_SAMPLE_STREAMS = 256
+
+# String columns that are hashed into features
+CATEGORICAL_COLUMNS = ('name', 'email', 'address', 'phone')
+
+# Splits values into the tokens that are hashed, e.g. an email into its local part and domain labels
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+class HashingEncoder:
+    """Stateless feature extraction for user rows: hashed string tokens plus the birth date ordinal"""
+
+    def __init__(self, columns=CATEGORICAL_COLUMNS, n_features=HASHING_FEATURES):
+        self.columns = tuple(columns)
+        self.n_features = n_features
+
+    def _tokens(self, row):
+        return [
+            f"{column}={token}"
+            for column in self.columns
+            for token in TOKEN_PATTERN.findall(str(row.get(column) or '').lower())
+        ]
+
+    def transform(self, rows):
+        """Sparse feature matrix for a batch of row dicts; unseen values simply hash to a column"""
+        from scipy.sparse import csr_matrix, hstack
+        from sklearn.feature_extraction import FeatureHasher
+
+        hasher = FeatureHasher(n_features=self.n_features, input_type='string', alternate_sign=False)
+        hashed = hasher.transform(self._tokens(row) for row in rows)
+        birth_dates = np.array([[row['birth_date'].toordinal() if row.get('birth_date') else 0] for row in rows],
+                               dtype=float)
+        return hstack([hashed, csr_matrix(birth_dates)], format='csr')
+
+
+def _timestamp(value):
+    """Seconds since the epoch; naive datetimes are taken as UTC like the rest of the generator"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+class SequenceModel:
+    """Trained LSTM over the order series, with what it needs to sample new orders"""
+
+    def __init__(self, model, stats, seed_windows, residual_std):
+        self.model = model
+        self.stats = stats
+        self.seed_windows = seed_windows
+        self.residual_std = residual_std
+
+    def sample(self, count, rng):
+        """Roll out SEQUENCE_SAMPLE_STREAMS streams side by side, one batched model call per step"""
+        streams = max(1, min(SEQUENCE_SAMPLE_STREAMS, count))
+        steps = -(-count // streams)
+        windows = self.seed_windows[rng.integers(0, len(self.seed_windows), streams)]
+        sampled = np.empty((steps, streams, SEQUENCE_FEATURES), dtype=np.float32)
+        for step in range(steps):
+            predicted = np.asarray(self.model(windows, training=False))
+            sampled[step] = predicted + rng.normal(0, 1, predicted.shape) * self.residual_std
+            windows = np.concatenate([windows[:, 1:], sampled[step][:, None]], axis=1)
+
+        series = sampled.reshape(-1, SEQUENCE_FEATURES)[:count] * self.stats['std'] + self.stats['mean']
+        timestamps = self.stats['last_timestamp'] + np.cumsum(np.expm1(np.maximum(series[:, 0], 0)))
+        created_at = [datetime.fromtimestamp(value, timezone.utc) for value in timestamps.tolist()]
+        return created_at, np.maximum(series[:, 1], 0.01)
+
+
 class MLDataGenerator:
     def __init__(self):
         self.models = {}
-        self.label_encoders = {}
+        self.encoder = HashingEncoder()
         
     def train_user_pattern_model(self, historical_data):
         """Train a model to generate realistic user patterns"""
         try:
-            # Convert data to DataFrame
-            df = pd.DataFrame(historical_data)
-            
-            # Convert datetime fields to timestamps
-            if 'birth_date' in df.columns:
-                df['birth_date'] = pd.to_datetime(df['birth_date']).astype(np.int64)
-            
-            # Encode categorical features
-            for col in ['name', 'email', 'address', 'phone']:
-                self.label_encoders[col] = LabelEncoder()
-                df[col] = self.label_encoders[col].fit_transform(df[col])
-            
-            # Prepare features and target
-            X = df.drop(['id', 'created_at'], axis=1)
-            y = df['is_active']
+            from sklearn.ensemble import RandomForestRegressor
+
+            # Encode features; is_active is the target, so it is not one of them
+            X = self.encoder.transform(historical_data)
+            y = np.array([bool(row['is_active']) for row in historical_data], dtype=float)
             
             # Train model
             model = RandomForestRegressor()
@@ -47,85 +121,154 @@ class MLDataGenerator:
             
     def generate_smart_user(self, base_features):
         """Generate a user with ML-enhanced features"""
+        return self.generate_smart_users([base_features])[0]
+
+    def generate_smart_users(self, base_features_list):
+        """Generate ML-enhanced users for a whole batch with a single prediction"""
+        if not base_features_list:
+            return []
         try:
             if 'user_pattern' not in self.models:
                 raise ValueError("User pattern model not trained")
-                
-            # Prepare features
-            features = pd.DataFrame([base_features])
-            
-            # Convert datetime fields to timestamps
-            if 'birth_date' in features.columns:
-                features['birth_date'] = pd.to_datetime(features['birth_date']).astype(np.int64)
-            
-            # Encode categorical features
-            for col, encoder in self.label_encoders.items():
-                if col in features.columns:
-                    features[col] = encoder.transform(features[col])
-            
-            # Drop unnecessary columns
-            features = features.drop(['id', 'created_at'], axis=1, errors='ignore')
             
             # Generate enhanced features
-            enhanced_features = self.models['user_pattern'].predict(features)
+            enhanced_features = self.models['user_pattern'].predict(self.encoder.transform(base_features_list))
             
-            return {
-                **base_features,
-                'is_active': bool(enhanced_features[0] > 0.5)
-            }
+            return [
+                {**base_features, 'is_active': bool(prediction > 0.5)}
+                for base_features, prediction in zip(base_features_list, enhanced_features)
+            ]
         except Exception as e:
-            logger.error(f"Error generating smart user: {str(e)}")
-            return base_features
+            logger.error(f"Error generating smart users: {str(e)}")
+            return list(base_features_list)
             
-    def train_sequence_model(self, historical_data):
+    def train_sequence_model(self, historical_data, epochs=SEQUENCE_EPOCHS, max_windows=SEQUENCE_MAX_WINDOWS,
+                             time_budget=None, seed=None):
         """Train a model to generate sequential data patterns"""
         try:
+            import tensorflow as tf
+            from tensorflow.keras import Input
+            from tensorflow.keras.callbacks import Callback
+            from tensorflow.keras.models import Sequential
+            from tensorflow.keras.layers import Dense, LSTM
+
             # Convert data to sequence format
-            sequences = self._prepare_sequences(historical_data)
+            series, stats = self._order_series(historical_data)
+            inputs, targets = self._prepare_sequences(series)
+            if not len(inputs):
+                raise ValueError(f"At least {SEQUENCE_WINDOW + 1} orders are needed to train the sequence model")
+            rng = np.random.default_rng(seed)
+            if len(inputs) > max_windows:
+                # Only the sampled windows are copied out of the view
+                index = np.sort(rng.choice(len(inputs), max_windows, replace=False))
+                inputs, targets = inputs[index], targets[index]
+
+            def batches():
+                # Windows are materialised one batch at a time, batches in a fresh order every epoch
+                for start in rng.permutation(np.arange(0, len(inputs), SEQUENCE_BATCH_SIZE)).tolist():
+                    yield inputs[start:start + SEQUENCE_BATCH_SIZE], targets[start:start + SEQUENCE_BATCH_SIZE]
+
+            dataset = tf.data.Dataset.from_generator(batches, output_signature=(
+                tf.TensorSpec((None, SEQUENCE_WINDOW, SEQUENCE_FEATURES), tf.float32),
+                tf.TensorSpec((None, SEQUENCE_FEATURES), tf.float32)
+            )).apply(tf.data.experimental.assert_cardinality(-(-len(inputs) // SEQUENCE_BATCH_SIZE))).prefetch(2)
+
+            class TimeBudget(Callback):
+                def on_train_batch_end(self, batch, logs=None):
+                    if time_budget is not None and time.perf_counter() - started > time_budget:
+                        self.model.stop_training = True
             
             # Create and train LSTM model
             model = Sequential([
-                LSTM(50, return_sequences=True, input_shape=(sequences.shape[1], sequences.shape[2])),
-                LSTM(50),
-                Dense(1)
+                Input((SEQUENCE_WINDOW, SEQUENCE_FEATURES)),
+                LSTM(SEQUENCE_UNITS, return_sequences=True),
+                LSTM(SEQUENCE_UNITS),
+                Dense(SEQUENCE_FEATURES)
             ])
             
             model.compile(optimizer='adam', loss='mse')
-            model.fit(sequences, epochs=10, batch_size=32)
+            started = time.perf_counter()
+            model.fit(dataset, epochs=epochs, callbacks=[TimeBudget()], shuffle=False, verbose=0)
+
+            # Residual spread of one step ahead predictions becomes the sampling noise
+            check = slice(-min(len(inputs), SEQUENCE_BATCH_SIZE * 8), None)
+            residuals = targets[check] - model.predict(inputs[check], batch_size=SEQUENCE_BATCH_SIZE, verbose=0)
             
-            self.models['sequence'] = model
-            logger.info("Sequence model trained successfully")
+            self.models['sequence'] = SequenceModel(model, stats, np.array(inputs[-SEQUENCE_SAMPLE_STREAMS:]),
+                                                    residuals.std(axis=0))
+            logger.info(f"Sequence model trained successfully in {time.perf_counter() - started:.2f}s")
             return True
         except Exception as e:
             logger.error(f"Error training sequence model: {str(e)}")
             return False
+
+    def sample_order_sequences(self, count, rng=None):
+        """Sample created_at and total_price for count consecutive orders with the sequence model"""
+        if 'sequence' not in self.models:
+            raise ValueError("Sequence model not trained")
+        return self.models['sequence'].sample(count, rng if rng is not None else np.random.default_rng())
+
+    @staticmethod
+    def _order_series(data):
+        """Normalised (log inter-arrival seconds, total_price) per order in created_at order, and its scaling"""
+        timestamps = np.array([_timestamp(row['created_at']) for row in data], dtype=float)
+        prices = np.array([row['total_price'] for row in data], dtype=float)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, prices = timestamps[order], prices[order]
+        gaps = np.diff(timestamps, prepend=timestamps[:1])
+        series = np.column_stack([np.log1p(np.maximum(gaps, 0)), prices])
+        mean = series.mean(axis=0)
+        std = series.std(axis=0)
+        std[std == 0] = 1
+        stats = {'mean': mean, 'std': std, 'last_timestamp': float(timestamps[-1]) if len(timestamps) else 0.0}
+        return ((series - mean) / std).astype(np.float32), stats
             
-    def _prepare_sequences(self, data):
+    def _prepare_sequences(self, data, window=SEQUENCE_WINDOW):
         """Prepare data for sequence model"""
-        # Implementation for sequence preparation
-        pass
-        
-    def save_models(self, path):
-        """Save trained models to disk"""
+        # Windows of window + 1 steps are strided views of the series: the first window steps are the
+        # input and the last one the target, and no step is copied
+        if len(data) <= window:
+            empty = np.empty((0, window, data.shape[1]), dtype=data.dtype)
+            return empty, empty[:, 0]
+        windows = np.lib.stride_tricks.sliding_window_view(data, window + 1, axis=0).transpose(0, 2, 1)
+        return windows[:, :-1], windows[:, -1]
+
+    def save_models(self, path, fingerprint=None):
+        """Save trained models to disk, tagged with the fingerprint of their training data"""
         try:
+            import joblib
+            os.makedirs(path, exist_ok=True)
             joblib.dump(self.models, f"{path}/models.joblib")
-            joblib.dump(self.label_encoders, f"{path}/encoders.joblib")
+            joblib.dump(self.encoder, f"{path}/encoders.joblib")
+            if fingerprint is not None:
+                with open(f"{path}/fingerprint.json", 'w') as f:
+                    json.dump({'fingerprint': fingerprint}, f)
             logger.info("Models saved successfully")
             return True
         except Exception as e:
             logger.error(f"Error saving models: {str(e)}")
             return False
             
-    def load_models(self, path):
-        """Load trained models from disk"""
+    def load_models(self, path, fingerprint=None):
+        """Load trained models from disk; with a fingerprint, only models trained on that data"""
         try:
+            if fingerprint is not None:
+                fingerprint_path = f"{path}/fingerprint.json"
+                if not os.path.exists(fingerprint_path):
+                    return False
+                with open(fingerprint_path) as f:
+                    if json.load(f).get('fingerprint') != fingerprint:
+                        logger.info("Cached models are stale")
+                        return False
+            import joblib
+            encoder = joblib.load(f"{path}/encoders.joblib")
+            if not isinstance(encoder, HashingEncoder):
+                logger.info("Cached models use an outdated encoder")
+                return False
             self.models = joblib.load(f"{path}/models.joblib")
-            self.label_encoders = joblib.load(f"{path}/encoders.joblib")
+            self.encoder = encoder
             logger.info("Models loaded successfully")
             return True
         except Exception as e:
             logger.error(f"Error loading models: {str(e)}")
             return False 
-
-
-            
\ No newline at end of file
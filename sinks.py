@@ -0,0 +1,224 @@
+import os
+import io
+import itertools
+import logging
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.orm import Session as SQLASession
+from exporters import ARROW_WRITERS, CSVWriter, JSONLinesWriter, open_text, table_file_name
+
+logger = logging.getLogger(__name__)
+
+# Formats generate_data can write straight to disk without a database
+FILE_SINK_FORMATS = ('csv', 'jsonl', 'parquet', 'feather')
+
+# Connection settings applied to SQLite before a bulk load
+SQLITE_BULK_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',
+)
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class DatabaseSink:
+    """Writes generated rows into the database with batched executemany inserts"""
+
+    def __init__(self, session: SQLASession):
+        self.session = session
+
+    def prepare(self):
+        pass
+
+    def next_id(self, table: Table) -> int:
+        return (self.session.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+    def write(self, table: Table, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+        """Insert rows in executemany batches, bypassing the ORM unit of work"""
+        statement = table.insert()
+        count = 0
+        for batch in chunked(rows, batch_size):
+            self.session.execute(statement, batch)
+            count += len(batch)
+        return count
+
+    def close(self):
+        # Every batch of the run shares the session's transaction, so this is the only commit
+        self.session.commit()
+
+    def abort(self):
+        """Discard the rows of an interrupted run"""
+        self.session.rollback()
+
+
+class SQLiteSink(DatabaseSink):
+    """Batched executemany inserts in a single transaction on a connection tuned for writes"""
+
+    def prepare(self):
+        """Apply SQLite pragmas that favour write throughput"""
+        for pragma in SQLITE_BULK_PRAGMAS:
+            self.session.execute(text(pragma))
+
+
+# Characters with a meaning in COPY's text format, escaped inside values
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    return str(value)
+
+
+def copy_text(rows: Iterable[tuple]) -> io.StringIO:
+    """Encode row tuples in the text format read by COPY ... FROM STDIN"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(map(_copy_value, row)))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+class PostgresCopySink(DatabaseSink):
+    """Streams generated rows into PostgreSQL with COPY FROM STDIN"""
+
+    def __init__(self, session: SQLASession):
+        super().__init__(session)
+        self._tables: List[Table] = []
+
+    def _copy_statement(self, table: Table) -> str:
+        preparer = self.session.get_bind().dialect.identifier_preparer
+        columns = ', '.join(preparer.quote(name) for name in table.columns.keys())
+        return f"COPY {preparer.format_table(table)} ({columns}) FROM STDIN"
+
+    def write(self, table: Table, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+        """Send rows in COPY batches over the session's connection, inside its transaction"""
+        statement = self._copy_statement(table)
+        to_tuple = itemgetter(*table.columns.keys())
+        cursor = self.session.connection().connection.cursor()
+        count = 0
+        try:
+            for batch in chunked(rows, batch_size):
+                buffer = copy_text(to_tuple(row) for row in batch)
+                if hasattr(cursor, 'copy_expert'):
+                    # psycopg2
+                    cursor.copy_expert(statement, buffer)
+                else:
+                    # psycopg 3
+                    with cursor.copy(statement) as copy:
+                        copy.write(buffer.getvalue())
+                count += len(batch)
+        finally:
+            cursor.close()
+        if table not in self._tables:
+            self._tables.append(table)
+        return count
+
+    def close(self):
+        # COPY bypasses the id sequences, so move them past the ids assigned in-process
+        advance_id_sequences(self.session, self._tables)
+        super().close()
+
+
+def advance_id_sequences(session: SQLASession, tables: Iterable[Table]):
+    """Move PostgreSQL id sequences past rows inserted with explicit ids; other backends need nothing"""
+    bind = session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    preparer = bind.dialect.identifier_preparer
+    for table in tables:
+        session.execute(
+            text(f"SELECT setval(pg_get_serial_sequence(:table, 'id'), max(id)) FROM {preparer.format_table(table)}"),
+            {'table': table.name}
+        )
+
+
+# Sink used for each database backend; any other dialect gets plain executemany inserts
+DATABASE_SINKS = {
+    'sqlite': SQLiteSink,
+    'postgresql': PostgresCopySink,
+}
+
+
+def database_sink(session: SQLASession) -> DatabaseSink:
+    """The fastest bulk-load sink for the database the session is bound to"""
+    return DATABASE_SINKS.get(session.get_bind().dialect.name, DatabaseSink)(session)
+
+
+class FileSink:
+    """Writes generated rows straight into one export file per table"""
+
+    def __init__(self, format: str, output_dir: str = '.', compression: Optional[str] = None,
+                 row_group_size: Optional[int] = None):
+        if format not in FILE_SINK_FORMATS:
+            raise ValueError(f"Unsupported output format: {format}")
+        self.format = format
+        self.output_dir = output_dir
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.paths: List[str] = []
+        self._writers = {}
+        self._files: List[TextIO] = []
+
+    def prepare(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def next_id(self, table: Table) -> int:
+        # Every run writes fresh files, so ids always start at 1
+        return 1
+
+    def _writer(self, table: Table):
+        if table.name not in self._writers:
+            path = os.path.join(self.output_dir, table_file_name(table.name, self.format, self.compression))
+            columns = table.columns.keys()
+            if self.format in ARROW_WRITERS:
+                writer = ARROW_WRITERS[self.format](path, table, self.compression, self.row_group_size)
+            else:
+                f = open_text(path, self.compression)
+                self._files.append(f)
+                writer = (CSVWriter if self.format == 'csv' else JSONLinesWriter)(f, columns)
+            self._writers[table.name] = (writer, itemgetter(*columns))
+            self.paths.append(path)
+        return self._writers[table.name]
+
+    def write(self, table: Table, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+        writer, to_tuple = self._writer(table)
+        count = 0
+        for batch in chunked(rows, batch_size):
+            writer.write_batch([to_tuple(row) for row in batch])
+            count += len(batch)
+        return count
+
+    def close(self):
+        self._release()
+        logger.info(f"Wrote {', '.join(self.paths)}")
+
+    def abort(self):
+        """Close the files of an interrupted run, leaving the rows written so far"""
+        self._release()
+
+    def _release(self):
+        writers, self._writers = self._writers, {}
+        files, self._files = self._files, []
+        try:
+            for writer, _ in writers.values():
+                writer.finish()
+        finally:
+            for f in files:
+                f.close()
@@ -0,0 +1,124 @@
+import pytest
+import csv
+import io
+import json
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from main import DataGenerator, Base, User
+from api import app, borrow_generator
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    Base.metadata.create_all(engine)
+    generator = DataGenerator(engine=engine)
+    generator.generate_data(5, 3, 7, bulk=True)
+    generator.session.close()
+    with TestClient(app) as client:
+        app.state.engine = engine
+        app.state.sessionmaker = sessionmaker(bind=engine)
+        yield client
+    engine.dispose()
+
+def test_keyset_pagination(client):
+    first = client.get('/orders', params={'limit': 4})
+    assert first.status_code == 200
+    assert [order['id'] for order in first.json()] == [1, 2, 3, 4]
+    after_id = first.headers['X-Next-After-Id']
+
+    second = client.get('/orders', params={'limit': 4, 'after_id': after_id})
+    assert [order['id'] for order in second.json()] == [5, 6, 7]
+    assert 'X-Next-After-Id' not in second.headers
+
+def test_response_model_fields(client):
+    user = client.get('/users', params={'limit': 1}).json()[0]
+    assert set(user) == {'id', 'name', 'email', 'address', 'phone', 'birth_date', 'is_active', 'created_at'}
+
+def test_ndjson_stream(client):
+    response = client.get('/products', params={'format': 'ndjson', 'after_id': 1})
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    products = [json.loads(line) for line in response.text.splitlines()]
+    assert [product['id'] for product in products] == [2, 3]
+
+def test_stream_generated_ndjson_is_reproducible(client):
+    def stream():
+        response = client.get('/stream/orders', params={'count': 1500, 'seed': 7, 'num_products': 5})
+        assert response.headers['content-type'].startswith('application/x-ndjson')
+        orders = [json.loads(line) for line in response.text.splitlines()]
+        for order in orders:
+            del order['created_at']
+        return orders
+
+    orders = stream()
+    assert len(orders) == 1500
+    assert [order['id'] for order in orders[:3]] == [1, 2, 3]
+    assert all(1 <= order['product_id'] <= 5 for order in orders)
+    assert stream() == orders
+
+def test_stream_generated_csv(client):
+    response = client.get('/stream/users', params={'count': 3, 'format': 'csv'})
+    assert response.headers['content-type'].startswith('text/csv')
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ['id', 'name', 'email', 'address', 'phone', 'birth_date', 'is_active', 'created_at']
+    assert len(rows) == 4
+
+def test_stream_unknown_entity(client):
+    assert client.get('/stream/invoices').status_code == 404
+
+def test_generate_rejects_invalid_sizes(client):
+    assert client.post('/generate', json={'num_users': None}).status_code == 422
+    assert client.post('/generate', json={'num_orders': -1}).status_code == 422
+    assert client.post('/generate', json={'workers': None}).status_code == 422
+    assert client.post('/generate', json={'chunk_size': 0}).status_code == 422
+    assert client.post('/export', json={'format': 'csv', 'workers': 0}).status_code == 422
+
+def wait_for_job(client, job_id):
+    for _ in range(200):
+        job = client.get(f'/jobs/{job_id}').json()
+        if job['status'] not in ('pending', 'running'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+def test_generate_with_schema_profile(client):
+    from sqlalchemy import inspect
+
+    job = client.post('/generate', json={'num_users': 3, 'num_products': 2, 'num_orders': 4,
+                                         'bulk': True, 'schema_profile': 'indexed'}).json()
+    assert wait_for_job(client, job['job_id'])['status'] == 'completed'
+    with app.state.sessionmaker() as session:
+        names = {index['name'] for index in inspect(session.connection()).get_indexes('orders')}
+    assert 'ix_orders_status_created_at' in names
+
+    response = client.post('/generate', json={'schema_profile': 'unknown'})
+    assert response.status_code == 400
+
+def test_overlapping_generate_jobs(client):
+    counts = {'num_users': 2000, 'num_products': 50, 'num_orders': 3000}
+    jobs = [client.post('/generate', json=counts).json(),
+            client.post('/generate', json={**counts, 'bulk': True}).json()]
+    for job in jobs:
+        assert wait_for_job(client, job['job_id'])['status'] == 'completed'
+    with app.state.sessionmaker() as session:
+        assert session.execute(select(func.count()).select_from(User.__table__)).scalar() == 5 + 2 * 2000
+        assert session.execute(select(func.max(User.id))).scalar() == 5 + 2 * 2000
+
+def test_borrowed_generator_releases_session(client):
+    request = SimpleNamespace(app=app)
+    with app.state.sessionmaker() as session, borrow_generator(request, session) as generator:
+        assert generator.session is session
+        assert generator.session.execute(select(func.count()).select_from(User.__table__)).scalar() == 5
+    assert generator.session is None
+
+    with app.state.sessionmaker() as session, borrow_generator(request, session) as again:
+        assert again is generator
+        assert again.session is session
@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import Config, Validator
+from utils.config import DEFAULT_CONFIG_PATH, ROOT_DIR
+
+CONFIG_TEMPLATE = """
+database:
+  path: {database}
+export:
+  output_directory: {export}
+validation:
+  email_domains: [{domain}]
+  min_age: 18
+  max_age: 100
+"""
+
+def write_config(path, database='test.db', export='exports', domain='example.com'):
+    path.write_text(CONFIG_TEMPLATE.format(database=database, export=export, domain=domain))
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / 'config.yaml'
+    write_config(path, export=str(tmp_path / 'exports'))
+    Config.load_config(str(path))
+    yield path
+    Config.disable_hot_reload()
+    Config.load_config(DEFAULT_CONFIG_PATH)
+
+def test_flattened_lookup(config_file):
+    assert Config.get('database.path') == 'test.db'
+    assert Config.get('validation.min_age') == 18
+    assert Config.get('validation')['max_age'] == 100
+    assert Config.get('validation.missing', 'fallback') == 'fallback'
+    assert Config.get('database.path.deeper') is None
+
+def test_precomputed_paths(config_file, tmp_path):
+    assert Config.get_database_path() == os.path.join(ROOT_DIR, 'test.db')
+    export_dir = Config.get_export_directory()
+    assert export_dir == str(tmp_path / 'exports')
+    assert os.path.isdir(export_dir)
+
+def test_typed_validation_config(config_file):
+    rules = Config.validation()
+    assert rules.email_domains == frozenset(['example.com'])
+    assert rules.phone_formats == {}
+    assert Config.get_validation_config()['email_domains'] == ['example.com']
+
+def test_hot_reload_on_mtime_change(config_file):
+    validator = Validator()
+    assert validator.validate_email('a@example.com')
+    snapshot = Config.snapshot()
+
+    write_config(config_file, domain='example.net')
+    os.utime(config_file, (snapshot.mtime + 10, snapshot.mtime + 10))
+    # Without hot reload the compiled snapshot is served as is
+    assert Config.snapshot() is snapshot
+
+    Config.enable_hot_reload(interval=0)
+    assert Config.snapshot() is not snapshot
+    assert Config.get('validation.email_domains') == ['example.net']
+    assert validator.validate_email('a@example.net')
+    assert not validator.validate_email('a@example.com')
+
+def test_hot_reload_keeps_last_good_config(config_file):
+    Config.enable_hot_reload(interval=0)
+    snapshot = Config.snapshot()
+    config_file.write_text('database: [unclosed')
+    os.utime(config_file, (snapshot.mtime + 10, snapshot.mtime + 10))
+    assert Config.get('database.path') == 'test.db'
+
+def test_database_url(config_file, monkeypatch):
+    assert Config.get_database_url() == f"sqlite:///{os.path.join(ROOT_DIR, 'test.db')}"
+
+    monkeypatch.setenv('DATABASE_URL', 'postgresql+psycopg2://generator@localhost/generator')
+    Config.load_config(str(config_file))
+    assert Config.get_database_url() == 'postgresql+psycopg2://generator@localhost/generator'
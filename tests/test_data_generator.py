@@ -1,4 +1,6 @@
 import pytest
+import json
+import yaml
 from datetime import datetime, date
 import sys
 import os
@@ -102,4 +104,518 @@ def test_export_data(generator):
         data = f.read()
         assert 'users' in data
         assert 'products' in data
-        assert 'orders' in data 
\ No newline at end of file
+        assert 'orders' in data 
+
+def test_generate_data_bulk(generator):
+    generator.generate_data(5, 10, 15, bulk=True)
+
+    assert session.query(User).count() == 5
+    assert session.query(Product).count() == 10
+    assert session.query(Order).count() == 15
+
+    user_ids = {user.id for user in session.query(User).all()}
+    products = {product.id: product for product in session.query(Product).all()}
+    for order in session.query(Order).all():
+        assert order.user_id in user_ids
+        assert order.product_id in products
+        assert order.total_price == pytest.approx(order.quantity * products[order.product_id].price)
+
+
+def test_database_sink_per_backend(generator):
+    from sqlalchemy import create_mock_engine
+    from sqlalchemy.orm import Session
+    from sinks import DatabaseSink, PostgresCopySink, SQLiteSink, database_sink
+
+    assert type(database_sink(generator.session)) is SQLiteSink
+    postgres = create_mock_engine('postgresql://', executor=None)
+    assert type(database_sink(Session(bind=postgres))) is PostgresCopySink
+    mysql = create_mock_engine('mysql://', executor=None)
+    assert type(database_sink(Session(bind=mysql))) is DatabaseSink
+
+
+def test_advance_id_sequences_only_on_postgres(generator):
+    from sqlalchemy import create_mock_engine
+    from sinks import advance_id_sequences
+
+    class RecordingSession:
+        def __init__(self, bind):
+            self.bind = bind
+            self.statements = []
+
+        def get_bind(self):
+            return self.bind
+
+        def execute(self, statement, params=None):
+            self.statements.append((str(statement), params))
+
+    postgres = RecordingSession(create_mock_engine('postgresql://', executor=None))
+    advance_id_sequences(postgres, [User.__table__, Order.__table__])
+    assert [params['table'] for _, params in postgres.statements] == ['users', 'orders']
+    assert 'setval' in postgres.statements[0][0]
+
+    sqlite = RecordingSession(generator.session.get_bind())
+    advance_id_sequences(sqlite, [User.__table__])
+    assert sqlite.statements == []
+
+
+def test_copy_text_escapes_values():
+    from sinks import copy_text
+
+    text = copy_text([(1, 'tab\there\nnew \\ line', None, '', True, 2.5, datetime(2024, 1, 2, 3, 4, 5))]).getvalue()
+    assert text == '1\ttab\\there\\nnew \\\\ line\t\\N\t\tt\t2.5\t2024-01-02 03:04:05\n'
+
+
+def test_generate_order_uses_price_index(generator):
+    generator.product_prices[42] = 10.0
+
+    order = generator.generate_order(1, 42)
+    assert order.total_price == pytest.approx(order.quantity * 10.0)
+
+
+def test_generate_data_streaming(generator):
+    generator.generate_data(5, 10, 15, chunk_size=4)
+
+    assert session.query(User).count() == 5
+    assert session.query(Product).count() == 10
+    assert session.query(Order).count() == 15
+    assert len(generator.session.identity_map) == 0
+
+    user_ids = {user.id for user in session.query(User).all()}
+    product_ids = {product.id for product in session.query(Product).all()}
+    for order in session.query(Order).all():
+        assert order.user_id in user_ids
+        assert order.product_id in product_ids
+
+
+def test_generate_data_parallel(generator):
+    generator.generate_data(6, 8, 20, chunk_size=3, workers=2)
+
+    users = session.query(User).all()
+    products = {product.id: product for product in session.query(Product).all()}
+    assert len(users) == 6
+    assert len(products) == 8
+    assert session.query(Order).count() == 20
+
+    user_ids = {user.id for user in users}
+    for order in session.query(Order).all():
+        assert order.user_id in user_ids
+        assert order.total_price == pytest.approx(order.quantity * products[order.product_id].price)
+
+
+def test_generate_data_bulk_vectorized(generator):
+    generator.generate_data(5, 10, 2500, bulk=True)
+
+    products = {product.id: product for product in session.query(Product).all()}
+    user_ids = {user.id for user in session.query(User).all()}
+    orders = session.query(Order).all()
+    assert len(orders) == 2500
+    for order in orders:
+        assert order.user_id in user_ids
+        assert order.status in ['pending', 'completed', 'cancelled']
+        assert order.total_price == pytest.approx(order.quantity * products[order.product_id].price)
+
+
+def test_price_array_built_once_per_run(generator, monkeypatch):
+    import main
+
+    calls = []
+    price_array = main.price_array
+    monkeypatch.setattr(main, 'price_array', lambda *args: calls.append(args) or price_array(*args))
+    generator.generate_data(3, 10, 4000, bulk=True, chunk_size=1000)
+
+    assert session.query(Order).count() == 4000
+    assert len(calls) == 1
+
+
+def test_generate_data_orm_vectorized(generator, monkeypatch):
+    calls = []
+    order_columns = generator.vectorized.order_columns
+    monkeypatch.setattr(generator.vectorized, 'order_columns',
+                        lambda size, *args: calls.append(size) or order_columns(size, *args))
+    generator.generate_data(5, 10, 2500)
+
+    assert calls == [2500]
+    products = {product.id: product for product in session.query(Product).all()}
+    user_ids = {user.id for user in session.query(User).all()}
+    orders = session.query(Order).all()
+    assert len(orders) == 2500
+    for order in orders:
+        assert order.user_id in user_ids
+        assert order.total_price == pytest.approx(order.quantity * products[order.product_id].price)
+
+
+def test_generate_user_uses_trained_model(generator):
+    from ml_generator import MLDataGenerator
+
+    # Every training user is inactive, so the model predicts is_active False for any row
+    rows = [generator._user_row() for _ in range(20)]
+    for row in rows:
+        row['is_active'] = False
+    generator.ml_generator = MLDataGenerator()
+    assert generator.ml_generator.train_user_pattern_model(rows)
+    generator.use_ml = True
+
+    users = [generator.generate_user() for _ in range(20)]
+    assert all(isinstance(user, User) for user in users)
+    assert not any(user.is_active for user in users)
+
+
+def test_parallel_workers_use_parent_models(tmp_path):
+    from datetime import timedelta
+    from sqlalchemy import create_engine
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'parallel_ml.db'}")
+    Base.metadata.create_all(engine)
+    seeded = DataGenerator(engine=engine)
+    seeded.generate_data(20, 5, 0, bulk=True)
+    seeded.session.query(User).update({'is_active': False})
+    # Five-minute order history in 2024, which the sequence model continues from
+    start = datetime(2024, 1, 1)
+    seeded.session.add_all(Order(user_id=1, product_id=1, quantity=1, total_price=10.0 + i % 7, status='completed',
+                                 created_at=start + timedelta(minutes=5 * i)) for i in range(200))
+    seeded.session.commit()
+    seeded.session.close()
+
+    generator = DataGenerator(engine=engine, use_ml=True, model_cache_dir=None, sequence_epochs=1)
+    assert {'user_pattern', 'sequence'} <= set(generator.ml_generator.models)
+    generator.generate_data(30, 5, 40, chunk_size=10, workers=2)
+
+    users = generator.session.query(User).filter(User.id > 20).all()
+    assert len(users) == 30
+    assert not any(user.is_active for user in users)
+    orders = generator.session.query(Order).filter(Order.id > 200).all()
+    assert len(orders) == 40
+    assert all(order.created_at.year < 2025 for order in orders)
+    generator.session.close()
+    engine.dispose()
+
+
+def test_generate_user_from_value_pool():
+    generator = DataGenerator(value_pool_size=100)
+    user = generator.generate_user()
+    assert user.name in generator.value_pool.values['name']
+    assert user.email in generator.value_pool.values['email']
+    assert generator.generate_product().description in generator.value_pool.values['text']
+
+
+def test_export_data_streams_projected_columns(generator, tmp_path):
+    generator.generate_data(3, 3, 3)
+
+    paths = generator.export_data('jsonl', output_dir=str(tmp_path))
+    assert len(paths) == 3
+    with open(tmp_path / 'orders.jsonl') as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 3
+    assert set(rows[0]) == set(Order.__table__.columns.keys())
+
+    generator.export_data('csv', output_dir=str(tmp_path), batch_size=2)
+    with open(tmp_path / 'users.csv') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ','.join(User.__table__.columns.keys())
+    assert len(lines) == 4
+
+    generator.export_data('json', output_dir=str(tmp_path))
+    with open(tmp_path / 'exported_data.json') as f:
+        data = json.load(f)
+    assert [len(data[table]) for table in ('users', 'products', 'orders')] == [3, 3, 3]
+    assert '_sa_instance_state' not in data['users'][0]
+
+    generator.export_data('yaml', output_dir=str(tmp_path))
+    with open(tmp_path / 'exported_data.yaml') as f:
+        data = yaml.safe_load(f)
+    assert len(data['products']) == 3
+
+
+def test_generate_data_to_files(generator, tmp_path):
+    generator.generate_data(4, 5, 12, output_format='jsonl', output_dir=str(tmp_path))
+
+    assert session.query(User).count() == 0
+    tables = {}
+    for table in ('users', 'products', 'orders'):
+        with open(tmp_path / f'{table}.jsonl') as f:
+            tables[table] = [json.loads(line) for line in f]
+    assert [row['id'] for row in tables['users']] == [1, 2, 3, 4]
+
+    prices = {product['id']: product['price'] for product in tables['products']}
+    assert len(tables['orders']) == 12
+    for order in tables['orders']:
+        assert 1 <= order['user_id'] <= 4
+        assert order['total_price'] == pytest.approx(order['quantity'] * prices[order['product_id']])
+
+
+def test_generate_data_reports_progress(generator):
+    reported = {}
+    generator.progress = lambda entity, rows: reported.update({entity: reported.get(entity, 0) + rows})
+
+    generator.generate_data(5, 10, 1500, bulk=True)
+    assert reported == {'users': 5, 'products': 10, 'orders': 1500}
+
+
+def test_seeded_chunks_are_reproducible(tmp_path):
+    from sqlalchemy import create_engine
+
+    def rows(table_name, workers):
+        engine = create_engine(f"sqlite:///{tmp_path / f'seeded_{workers}.db'}")
+        Base.metadata.create_all(engine)
+        generator = DataGenerator(engine=engine, seed=99)
+        generator.generate_data(6, 5, 11, chunk_size=4, workers=workers)
+        table = Base.metadata.tables[table_name]
+        result = [dict(row._mapping) for row in generator.session.execute(table.select().order_by(table.c.id))]
+        generator.session.close()
+        engine.dispose()
+        return result
+
+    def without_created_at(rows):
+        return [{key: value for key, value in row.items() if key != 'created_at'} for row in rows]
+
+    orders = without_created_at(rows('orders', workers=2))
+    assert without_created_at(rows('orders', workers=1)) == orders
+
+    # Chunk 1 of 4 rows holds orders 5-8, rebuilt without generating anything else
+    chunk = DataGenerator(seed=99).regenerate_chunk('orders', 1, 6, 5, 11, chunk_size=4)
+    assert without_created_at(chunk) == orders[4:8]
+
+
+def freeze_clock(monkeypatch, day):
+    """Pin date.today() and datetime.now() in main and Faker to noon on day"""
+    import main
+    import faker.providers.date_time
+
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return day
+
+    class FrozenDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(day.year, day.month, day.day, 12, tzinfo=tz)
+
+    monkeypatch.setattr(main, 'date', FrozenDate)
+    monkeypatch.setattr(main, 'datetime', FrozenDateTime)
+    monkeypatch.setattr(faker.providers.date_time, 'datetime', FrozenDateTime)
+
+
+@pytest.mark.parametrize('validate', [False, True])
+def test_seeded_users_reproducible_on_another_day(monkeypatch, validate):
+    def chunk(day):
+        freeze_clock(monkeypatch, day)
+        rows = DataGenerator(seed=42, validate=validate).regenerate_chunk('users', 0, 50, 5, 5, chunk_size=50)
+        return [{key: value for key, value in row.items() if key != 'created_at'} for row in rows]
+
+    first = chunk(date(2026, 3, 1))
+    assert first == chunk(date(2027, 3, 2))
+    assert all(row['birth_date'] <= date(2025, 1, 1) for row in first)
+
+
+def test_ml_models_cached_by_training_data(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from ml_generator import MLDataGenerator
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'ml.db'}")
+    Base.metadata.create_all(engine)
+    DataGenerator(engine=engine).generate_data(5, 0, 0, bulk=True)
+
+    trained = []
+    train = MLDataGenerator.train_user_pattern_model
+    monkeypatch.setattr(MLDataGenerator, 'train_user_pattern_model',
+                        lambda self, data: trained.append(len(data)) or train(self, data))
+    cache_dir = str(tmp_path / 'models')
+
+    first = DataGenerator(engine=engine, use_ml=True, model_cache_dir=cache_dir)
+    assert trained == [5]
+    assert os.path.exists(os.path.join(cache_dir, 'fingerprint.json'))
+
+    second = DataGenerator(engine=engine, use_ml=True, model_cache_dir=cache_dir)
+    assert trained == [5]
+    assert 'user_pattern' in second.ml_generator.models
+
+    # New users make the cached models stale
+    first.generate_data(2, 0, 0, bulk=True)
+    DataGenerator(engine=engine, use_ml=True, model_cache_dir=cache_dir)
+    assert trained == [5, 7]
+    engine.dispose()
+
+
+def test_generate_orders_from_sequence_model(tmp_path):
+    import numpy as np
+    from sqlalchemy import create_engine
+    from utils import Validator
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sequence.db'}")
+    Base.metadata.create_all(engine)
+    DataGenerator(engine=engine).generate_data(5, 10, 100, bulk=True)
+
+    cache_dir = str(tmp_path / 'models')
+    DataGenerator(engine=engine, use_ml=True, model_cache_dir=cache_dir, sequence_epochs=1)
+    generator = DataGenerator(engine=engine, use_ml=True, model_cache_dir=cache_dir)
+    assert 'sequence' in generator.ml_generator.models
+
+    generator.generate_data(1, 5, 1500, bulk=True)
+    products = {product.id: product.price for product in generator.session.query(Product).all()}
+    orders = generator.session.query(Order).filter(Order.id > 100).all()
+    assert len(orders) == 1500
+    for order in orders:
+        assert 1 <= order.quantity <= 10
+        assert order.total_price == pytest.approx(order.quantity * products[order.product_id])
+
+    # Orders redrawn after failing validation are sampled from the sequence model as well
+    sequenced = []
+    sequence_orders = generator._sequence_orders
+    generator.validator = Validator()
+    rejected = []
+
+    def reject_first_block(entity, rows):
+        masks = np.zeros(len(rows), dtype=np.uint8)
+        if entity == 'orders' and not rejected:
+            rejected.append(len(rows))
+            masks[:] = 1
+        return masks
+
+    def record_sequence_orders(rows):
+        sequenced.append(len(rows))
+        return sequence_orders(rows)
+
+    generator._validation_masks = reject_first_block
+    generator._sequence_orders = record_sequence_orders
+    for options in ({'bulk': True}, {}):
+        sequenced.clear()
+        rejected.clear()
+        generator.generate_data(1, 1, 20, **options)
+        assert sequenced == [20, 20]
+    generator.session.close()
+    engine.dispose()
+
+
+def test_generate_data_validated(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from utils import Config
+
+    Config.load_config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml'))
+    engine = create_engine(f"sqlite:///{tmp_path / 'validated.db'}")
+    Base.metadata.create_all(engine)
+    generator = DataGenerator(engine=engine, validate=True, seed=3)
+
+    # Constrained draws pass first time
+    generator.generate_data(30, 5, 20, bulk=True)
+    assert generator.validation_stats['users'].acceptance_rate == 1.0
+
+    # Birth dates drawn outside the age window have to be repaired by rejection sampling
+    constrain_user = generator._constrain_user
+
+    def constrain_all_but_age(row):
+        constrain_user(row)
+        row['birth_date'] = generator.fake.date_of_birth()
+
+    monkeypatch.setattr(generator, '_constrain_user', constrain_all_but_age)
+    generator.generate_data(300, 0, 0, bulk=True)
+    stats = generator.validation_stats['users']
+    assert stats.accepted == 300
+    assert stats.regenerated > 0 and stats.acceptance_rate < 1.0
+
+    users = [dict(row._mapping) for row in generator.session.execute(User.__table__.select())]
+    assert len(users) == 330
+    assert not generator.validator.validate_users(users, 'en_US', generator.reference_date).any()
+    generator.session.close()
+    engine.dispose()
+
+
+def test_schema_profile_indexes_built_after_load(tmp_path):
+    from sqlalchemy import create_engine, inspect
+    from main import SCHEMA_PROFILES
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexed.db'}")
+    Base.metadata.create_all(engine)
+    generator = DataGenerator(engine=engine, schema_profile='indexed')
+
+    def indexes():
+        inspector = inspect(generator.session.connection())
+        return {index['name']: (table, tuple(index['column_names']))
+                for table in ('orders', 'products') for index in inspector.get_indexes(table)}
+
+    # Every database load path drops the indexes before inserting and rebuilds them afterwards
+    during_load = []
+    generator.progress = lambda entity, rows: during_load.append(indexes())
+    for options in ({'bulk': True}, {'chunk_size': 4}, {}):
+        during_load.clear()
+        generator.generate_data(5, 10, 20, **options)
+        assert during_load and not any(during_load)
+        assert indexes() == SCHEMA_PROFILES['indexed']
+    generator.session.close()
+    engine.dispose()
+
+    with pytest.raises(ValueError):
+        DataGenerator(schema_profile='unknown')
+
+
+def test_schema_profile_indexes_restored_after_failed_load(tmp_path):
+    from sqlalchemy import create_engine, inspect
+    from jobs import JobCancelled
+    from main import SCHEMA_PROFILES
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexed.db'}")
+    Base.metadata.create_all(engine)
+    generator = DataGenerator(engine=engine, schema_profile='indexed')
+
+    def cancel(entity, rows):
+        if entity == 'orders':
+            raise JobCancelled('cancelled while loading orders')
+
+    generator.progress = cancel
+    for options in ({'bulk': True}, {'chunk_size': 4}, {}):
+        with pytest.raises(JobCancelled):
+            generator.generate_data(5, 10, 20, **options)
+        inspector = inspect(generator.session.connection())
+        names = {index['name'] for table in ('orders', 'products') for index in inspector.get_indexes(table)}
+        assert names == set(SCHEMA_PROFILES['indexed'])
+    generator.session.close()
+    engine.dispose()
+
+
+def test_interrupted_file_output_closes_files(generator, tmp_path, monkeypatch):
+    import main
+
+    sinks = []
+
+    class RecordingFileSink(main.FileSink):
+        def _writer(self, table):
+            sinks.append(self)
+            return super()._writer(table)
+
+    def cancel(entity, rows):
+        if entity == 'products':
+            raise RuntimeError('cancelled')
+
+    monkeypatch.setattr(main, 'FileSink', RecordingFileSink)
+    generator.progress = cancel
+    with pytest.raises(RuntimeError):
+        generator.generate_data(5, 5, 5, bulk=True, output_format='csv', output_dir=str(tmp_path))
+    assert sinks and not sinks[0]._files and not sinks[0]._writers
+    with open(tmp_path / 'users.csv') as f:
+        assert len(f.read().splitlines()) == 6
+
+
+def test_validated_unique_emails_stay_distinct(tmp_path):
+    from sqlalchemy import create_engine
+    from utils import Config
+
+    default_config = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml')
+    with open(default_config) as f:
+        config = yaml.safe_load(f)
+    # Pooled emails sharing a local part on different domains used to collapse into one address
+    config['validation']['email_domains'] = ['example.com']
+    with open(tmp_path / 'config.yaml', 'w') as f:
+        yaml.safe_dump(config, f)
+    Config.load_config(str(tmp_path / 'config.yaml'))
+    try:
+        engine = create_engine(f"sqlite:///{tmp_path / 'emails.db'}")
+        Base.metadata.create_all(engine)
+        generator = DataGenerator(engine=engine, validate=True, value_pool_size=2000, unique_emails=True, seed=5)
+        generator.generate_data(4000, 0, 0, bulk=True)
+        emails = [email for email, in generator.session.query(User.email)]
+        assert len(emails) == len(set(emails)) == 4000
+        assert all(email.endswith('@example.com') for email in emails)
+        generator.session.close()
+        engine.dispose()
+    finally:
+        Config.load_config(default_config)
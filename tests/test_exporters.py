@@ -0,0 +1,76 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from main import DataGenerator, Base, EXPORT_TABLES
+from exporters import export_tables
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq
+
+@pytest.fixture
+def generator(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine)
+    generator = DataGenerator(engine=engine)
+    generator.generate_data(4, 5, 10, bulk=True)
+    yield generator
+    generator.session.close()
+    engine.dispose()
+
+def test_parquet_export_row_groups(generator, tmp_path):
+    paths = export_tables(generator.session, EXPORT_TABLES, 'parquet', str(tmp_path / 'out'),
+                          batch_size=3, compression='zstd', row_group_size=4)
+    assert [os.path.basename(path) for path in paths] == ['users.parquet', 'products.parquet', 'orders.parquet']
+
+    orders = pq.ParquetFile(tmp_path / 'out' / 'orders.parquet')
+    assert [orders.metadata.row_group(i).num_rows for i in range(orders.num_row_groups)] == [4, 4, 2]
+    table = orders.read()
+    assert table.column_names == list(EXPORT_TABLES['orders'].columns.keys())
+    assert table.column('id').to_pylist() == sorted(table.column('id').to_pylist())
+    assert table.schema.field('total_price').type == pa.float64()
+
+def test_feather_export(generator, tmp_path):
+    generator.export_data('feather', output_dir=str(tmp_path), compression='zstd')
+    users = pa.ipc.open_file(tmp_path / 'users.feather').read_all()
+    assert users.num_rows == 4
+    assert users.schema.field('is_active').type == pa.bool_()
+    assert users.schema.field('created_at').type == pa.timestamp('us')
+
+def test_generate_data_to_parquet(tmp_path):
+    generator = DataGenerator()
+    generator.generate_data(3, 4, 2500, output_format='parquet', output_dir=str(tmp_path))
+
+    users = pq.read_table(tmp_path / 'users.parquet')
+    orders = pq.read_table(tmp_path / 'orders.parquet')
+    assert users.num_rows == 3
+    assert users.schema.field('birth_date').type == pa.timestamp('us')
+    assert orders.num_rows == 2500
+    assert orders.column('id').to_pylist() == list(range(1, 2501))
+
+def test_parallel_export_writes_parts_and_manifest(generator, tmp_path):
+    import csv
+    import gzip
+    import json
+    from exporters import export_tables_parallel, sha256_file
+
+    out = tmp_path / 'parallel'
+    manifest = export_tables_parallel(generator.session, EXPORT_TABLES, 'csv', str(out),
+                                      compression='gzip', workers=2, part_rows=4)
+
+    assert manifest['tables'] == {'users': 4, 'products': 5, 'orders': 10}
+    order_files = [entry for entry in manifest['files'] if entry['table'] == 'orders']
+    assert [entry['path'] for entry in order_files] == [f'orders.part-0000{i}.csv.gz' for i in range(3)]
+
+    for entry in manifest['files']:
+        path = out / entry['path']
+        assert sha256_file(str(path)) == entry['sha256']
+        with gzip.open(path, 'rt', newline='') as f:
+            assert len(list(csv.reader(f))) == entry['rows'] + 1
+
+    with open(out / 'manifest.json') as f:
+        assert json.load(f)['files'] == manifest['files']
@@ -0,0 +1,82 @@
+import pytest
+import time
+import threading
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobs import JobManager
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1)
+    yield manager
+    manager.shutdown()
+
+def wait_for(job, statuses=('completed', 'failed', 'cancelled'), timeout=5):
+    deadline = time.time() + timeout
+    while job.status not in statuses and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+def test_job_reports_progress(manager):
+    def work(job):
+        for _ in range(10):
+            job.advance('users', 10)
+
+    job = manager.submit(100, work)
+    assert wait_for(job) == 'completed'
+    state = manager.get(job.id).to_dict()
+    assert state['rows_produced'] == 100
+    assert state['rows_per_sec'] > 0
+    assert state['eta_seconds'] is None
+
+def test_job_failure_is_recorded(manager):
+    def work(job):
+        raise RuntimeError('boom')
+
+    job = manager.submit(1, work)
+    assert wait_for(job) == 'failed'
+    assert job.error == 'boom'
+
+def test_cancel_running_and_queued_jobs(manager):
+    def work(job):
+        while True:
+            job.advance('orders', 1)
+            time.sleep(0.001)
+
+    running = manager.submit(10 ** 9, work)
+    queued = manager.submit(10, work)
+    assert wait_for(running, statuses=('running',)) == 'running'
+
+    manager.cancel(queued.id)
+    manager.cancel(running.id)
+    assert wait_for(running) == 'cancelled'
+    assert queued.status == 'cancelled'
+    assert manager.cancel('missing') is None
+
+def test_finished_jobs_are_evicted():
+    manager = JobManager(max_workers=1, ttl_seconds=60, max_history=2)
+    try:
+        finished = [manager.submit(1, lambda job: None) for _ in range(3)]
+        for job in finished:
+            wait_for(job)
+
+        # Only the newest max_history finished jobs are kept
+        assert manager.get(finished[0].id) is None
+        assert manager.get(finished[1].id) is finished[1]
+        assert manager.get(finished[2].id) is finished[2]
+
+        # Past the TTL finished jobs are dropped, while running ones stay
+        release = threading.Event()
+        running = manager.submit(1, lambda job: release.wait())
+        assert wait_for(running, statuses=('running',)) == 'running'
+        manager.ttl_seconds = 0
+        time.sleep(0.01)
+        assert manager.get(finished[2].id) is None
+        assert manager.get(running.id) is running
+        release.set()
+    finally:
+        manager.shutdown()
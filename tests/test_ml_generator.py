@@ -1,12 +1,13 @@
 import pytest
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta, timezone
 import sys
 import os
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ml_generator import MLDataGenerator
+from ml_generator import HASHING_FEATURES, MLDataGenerator
 from main import User, session, Base, engine
 
 @pytest.fixture(autouse=True)
@@ -112,4 +113,97 @@ def test_save_load_models(ml_generator, tmp_path):
     new_generator = MLDataGenerator()
     load_result = new_generator.load_models(tmp_path)
     assert load_result is True
-    assert 'user_pattern' in new_generator.models 
\ No newline at end of file
+    assert 'user_pattern' in new_generator.models
+
+
+def test_generate_smart_users_batch(ml_generator):
+    test_users = [
+        {
+            'id': 1,
+            'name': 'John Doe',
+            'email': 'john@example.com',
+            'address': '123 Main St',
+            'phone': '1234567890',
+            'birth_date': datetime(1990, 1, 1),
+            'is_active': True,
+            'created_at': datetime.now()
+        },
+        {
+            'id': 2,
+            'name': 'Jane Smith',
+            'email': 'jane@example.com',
+            'address': '456 Oak Ave',
+            'phone': '0987654321',
+            'birth_date': datetime(1995, 2, 2),
+            'is_active': False,
+            'created_at': datetime.now()
+        }
+    ]
+    ml_generator.train_user_pattern_model(test_users)
+
+    # Key order differs from training, the batch path must line columns up itself
+    batch = [{key: user[key] for key in reversed(list(user))} for user in test_users * 3]
+    enhanced = ml_generator.generate_smart_users(batch)
+    assert len(enhanced) == 6
+    assert all(isinstance(user['is_active'], bool) for user in enhanced)
+    assert [user['id'] for user in enhanced] == [1, 2] * 3
+    assert enhanced == [ml_generator.generate_smart_user(user) for user in batch]
+    assert ml_generator.generate_smart_users([]) == []
+
+
+def test_smart_users_handle_unseen_values(ml_generator):
+    test_users = [
+        {
+            'id': i,
+            'name': f'User {i}',
+            'email': f'user{i}@example.com',
+            'address': f'{i} Main St',
+            'phone': f'555-000{i}',
+            'birth_date': datetime(1990, 1, i),
+            'is_active': False,
+            'created_at': datetime.now()
+        }
+        for i in range(1, 5)
+    ]
+    ml_generator.train_user_pattern_model(test_users)
+
+    unseen = {
+        'id': 10,
+        'name': 'Nobody Seen',
+        'email': 'nobody@elsewhere.org',
+        'address': '1 Unknown Rd',
+        'phone': '999',
+        'birth_date': datetime(2001, 6, 6),
+        'is_active': True,
+        'created_at': datetime.now()
+    }
+    # The prediction comes from the model, not from the base user's own flag
+    assert ml_generator.generate_smart_user(unseen)['is_active'] is False
+
+    features = ml_generator.encoder.transform([unseen, test_users[0]])
+    assert features.shape == (2, HASHING_FEATURES + 1)
+
+
+def test_prepare_sequences_are_views(ml_generator):
+    series = np.arange(20, dtype=np.float32).reshape(10, 2)
+    inputs, targets = ml_generator._prepare_sequences(series, window=3)
+    assert inputs.shape == (7, 3, 2)
+    assert targets.shape == (7, 2)
+    assert np.shares_memory(inputs, series) and np.shares_memory(targets, series)
+    assert inputs[1].tolist() == series[1:4].tolist()
+    assert targets[1].tolist() == series[4].tolist()
+
+
+def test_train_and_sample_order_sequences(ml_generator):
+    start = datetime(2024, 1, 1)
+    orders = [
+        {'created_at': start + timedelta(minutes=5 * i), 'total_price': 10.0 + i % 7}
+        for i in range(200)
+    ]
+    assert ml_generator.train_sequence_model(orders, epochs=2, time_budget=30, seed=0) is True
+
+    created_at, totals = ml_generator.sample_order_sequences(300, np.random.default_rng(0))
+    assert len(created_at) == len(totals) == 300
+    assert created_at == sorted(created_at)
+    assert created_at[0] >= orders[-1]['created_at'].replace(tzinfo=timezone.utc)
+    assert (totals > 0).all()
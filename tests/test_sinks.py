@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from main import DataGenerator, Base, User, Product, Order
+from sinks import PostgresCopySink, database_sink
+from utils.config import DATABASE_URL_ENV
+
+# Integration tests against a live PostgreSQL, such as the db service of docker-compose.yml
+DATABASE_URL = os.environ.get(DATABASE_URL_ENV)
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL or make_url(DATABASE_URL).get_backend_name() != 'postgresql',
+    reason=f'{DATABASE_URL_ENV} does not point at PostgreSQL'
+)
+
+TABLES = (User.__table__, Product.__table__, Order.__table__)
+
+
+def truncate(engine):
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {', '.join(table.name for table in TABLES)} RESTART IDENTITY"))
+
+
+@pytest.fixture
+def postgres():
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.create_all(engine)
+    truncate(engine)
+    yield engine
+    truncate(engine)
+    engine.dispose()
+
+
+def test_postgres_bulk_load_uses_copy(postgres):
+    with Session(bind=postgres) as session:
+        assert type(database_sink(session)) is PostgresCopySink
+
+
+@pytest.mark.parametrize('options', [{'bulk': True}, {'bulk': True, 'workers': 2, 'chunk_size': 500},
+                                     {'chunk_size': 500}, {}])
+def test_postgres_load_keeps_keys_and_sequences(postgres, options):
+    generator = DataGenerator(engine=postgres, seed=7)
+    # Twice, so the second run starts from the ids the first one left behind
+    for _ in range(2):
+        generator.generate_data(1200, 40, 2500, **options)
+    generator.session.close()
+
+    with Session(bind=postgres) as session:
+        counts = {table.name: session.execute(select(func.count()).select_from(table)).scalar() for table in TABLES}
+        assert counts == {'users': 2400, 'products': 80, 'orders': 5000}
+        assert session.execute(select(func.max(User.id))).scalar() == 2400
+
+        orphans = session.execute(
+            select(func.count()).select_from(Order.__table__)
+            .outerjoin(User.__table__, User.id == Order.user_id)
+            .outerjoin(Product.__table__, Product.id == Order.product_id)
+            .where((User.id.is_(None)) | (Product.id.is_(None)))
+        ).scalar()
+        assert orphans == 0
+
+        # Inserts that leave the id to the database continue after the loaded rows
+        user, product, order = User(name='after load'), Product(name='after load'), Order(quantity=1)
+        session.add_all([user, product, order])
+        session.commit()
+        assert (user.id, product.id, order.id) == (2401, 81, 5001)
@@ -0,0 +1,26 @@
+import pytest
+import re
+import subprocess
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import budget for main and api, an order of magnitude below what the eager ML stack cost
+STARTUP_BUDGET_SECONDS = 2.0
+
+HEAVY_MODULES = ('tensorflow', 'sklearn', 'pandas', 'pyarrow', 'joblib')
+
+def import_profile(module, tmp_path):
+    """Cumulative import time of module in seconds and the heavy modules it pulled in"""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=tmp_path,
+                            env={**os.environ, 'PYTHONPATH': ROOT}, capture_output=True, text=True, check=True)
+    match = re.search(rf'^import time:\s+\d+ \|\s+(\d+) \| {module}$', result.stderr, re.MULTILINE)
+    return int(match.group(1)) / 1e6, [name for name in result.stdout.strip().split(',') if name]
+
+@pytest.mark.parametrize('module', ['main', 'api'])
+def test_import_skips_ml_stack(module, tmp_path):
+    seconds, heavy = import_profile(module, tmp_path)
+    assert heavy == []
+    assert seconds < STARTUP_BUDGET_SECONDS
@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+from datetime import date, datetime
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils import Config, Validator
+from utils.validator import OrderError, ProductError, UserError
+
+@pytest.fixture
+def validator():
+    Config.load_config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml'))
+    return Validator()
+
+def years_ago(years):
+    today = date.today()
+    return today.replace(year=today.year - years, day=min(today.day, 28))
+
+USERS = [
+    {'email': 'ok@example.com', 'phone': '555-123-4567', 'birth_date': years_ago(30)},
+    {'email': 'ok@elsewhere.com', 'phone': '555-123-4567', 'birth_date': years_ago(30)},
+    {'email': 'not an email', 'phone': '555.123.4567', 'birth_date': datetime(2020, 1, 1)},
+    {'email': 'ok@example.org', 'phone': None, 'birth_date': years_ago(101)},
+    {'email': None, 'phone': '555-123-4567', 'birth_date': None},
+]
+
+def test_validate_users_matches_row_checks(validator):
+    masks = validator.validate_users(USERS, 'en_US')
+    assert masks.dtype == np.uint8
+    assert masks.tolist() == [
+        0,
+        UserError.EMAIL,
+        UserError.EMAIL | UserError.PHONE | UserError.AGE,
+        UserError.PHONE | UserError.AGE,
+        UserError.EMAIL | UserError.AGE,
+    ]
+    for user, mask in zip(USERS, masks):
+        row = dict(user, birth_date=user['birth_date'] or date.today())
+        assert validator.validate_user(row, 'en_US')['is_valid'] == (mask == 0)
+
+def test_validate_users_accepts_dataframes(validator):
+    pd = pytest.importorskip('pandas')
+    frame = pd.DataFrame(USERS)
+    assert validator.validate_users(frame, 'en_US').tolist() == validator.validate_users(USERS, 'en_US').tolist()
+
+def test_validate_products_and_orders(validator):
+    products = [
+        {'name': 'widget', 'price': 9.99, 'stock_quantity': 3},
+        {'name': '', 'price': 0, 'stock_quantity': 2.0},
+        {'name': 'gadget', 'price': '5', 'stock_quantity': -1},
+    ]
+    assert validator.validate_products(products).tolist() == [
+        0,
+        ProductError.NAME | ProductError.PRICE | ProductError.STOCK_QUANTITY,
+        ProductError.PRICE | ProductError.STOCK_QUANTITY,
+    ]
+
+    # Columns straight from the vectorized backend are validated without row dicts
+    orders = {
+        'user_id': np.array([1, 0, 2]),
+        'product_id': np.array([1, 1, 0]),
+        'quantity': np.array([2, 0, 1]),
+        'total_price': np.array([10.0, 5.0, -1.0]),
+        'status': np.array(['pending', 'shipped', 'completed']),
+    }
+    assert validator.validate_orders(orders).tolist() == [
+        0,
+        OrderError.USER_ID | OrderError.QUANTITY | OrderError.STATUS,
+        OrderError.PRODUCT_ID | OrderError.TOTAL_PRICE,
+    ]
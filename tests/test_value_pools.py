@@ -0,0 +1,36 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from value_pools import ValuePool, FIELD_PROVIDERS
+
+@pytest.fixture
+def pool():
+    return ValuePool('en_US', size=200, seed=42)
+
+def test_pools_are_built_for_every_field(pool):
+    for field in FIELD_PROVIDERS:
+        assert pool.values[field]
+    assert pool.sample('name') in pool.values['name']
+
+def test_unique_emails():
+    pool = ValuePool('en_US', size=50, unique_emails=True, seed=42)
+    emails = [pool.email(index) for index in range(500)]
+    assert len(set(emails)) == len(emails)
+    assert all('@' in email for email in emails)
+
+def test_pools_are_cached_on_disk(tmp_path):
+    first = ValuePool('en_US', size=100, cache_dir=str(tmp_path))
+    assert os.path.exists(ValuePool.cache_path(str(tmp_path), 'en_US'))
+
+    second = ValuePool('en_US', size=100, cache_dir=str(tmp_path))
+    assert second.values == first.values
+
+def test_unique_emails_on_restricted_domains():
+    pool = ValuePool('en_US', size=200, unique_emails=True, seed=42, email_domains=['example.com', 'example.org'])
+    emails = [pool.email(index) for index in range(1000)]
+    assert len(set(emails)) == len(emails)
+    assert {email.split('@')[1] for email in emails} <= {'example.com', 'example.org'}
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from faker import Faker
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vectorized import VectorizedBackend, ORDER_STATUSES, iter_rows, price_array
+
+SAMPLES = 20000
+
+@pytest.fixture
+def backend():
+    return VectorizedBackend(seed=1234)
+
+@pytest.fixture
+def fake():
+    fake = Faker('en_US')
+    fake.seed_instance(1234)
+    return fake
+
+def test_product_columns_match_faker(backend, fake):
+    columns = backend.product_columns(SAMPLES)
+    faker_prices = np.array([fake.pyfloat(left_digits=2, right_digits=2, positive=True) for _ in range(SAMPLES)])
+    faker_stock = np.array([fake.random_int(min=0, max=1000) for _ in range(SAMPLES)])
+
+    assert columns['price'].min() > 0
+    assert columns['price'].max() < 100
+    assert np.allclose(columns['price'], np.round(columns['price'], 2))
+    assert columns['price'].mean() == pytest.approx(faker_prices.mean(), rel=0.03)
+    assert columns['price'].std() == pytest.approx(faker_prices.std(), rel=0.03)
+
+    assert columns['stock_quantity'].min() >= 0
+    assert columns['stock_quantity'].max() <= 1000
+    assert columns['stock_quantity'].mean() == pytest.approx(faker_stock.mean(), rel=0.03)
+
+def test_user_columns_match_faker(backend, fake):
+    is_active = backend.user_columns(SAMPLES)['is_active']
+    faker_active = np.array([fake.boolean() for _ in range(SAMPLES)])
+
+    assert is_active.dtype == bool
+    assert is_active.mean() == pytest.approx(faker_active.mean(), abs=0.02)
+
+def test_order_columns(backend, fake):
+    prices = price_array({10 + i: float(i + 1) for i in range(50)}, 10, 50)
+    columns = backend.order_columns(SAMPLES, 100, 20, 10, prices)
+    faker_quantity = np.array([fake.random_int(min=1, max=10) for _ in range(SAMPLES)])
+
+    assert columns['user_id'].min() >= 100
+    assert columns['user_id'].max() <= 119
+    assert columns['product_id'].min() >= 10
+    assert columns['product_id'].max() <= 59
+    assert columns['quantity'].min() >= 1
+    assert columns['quantity'].max() <= 10
+    assert columns['quantity'].mean() == pytest.approx(faker_quantity.mean(), rel=0.03)
+    assert np.allclose(columns['total_price'], columns['quantity'] * (columns['product_id'] - 9))
+
+    statuses, counts = np.unique(columns['status'], return_counts=True)
+    assert set(statuses.tolist()) == set(ORDER_STATUSES)
+    assert np.allclose(counts / SAMPLES, 1 / len(ORDER_STATUSES), atol=0.02)
+
+def test_iter_rows_yields_python_values(backend):
+    rows = list(iter_rows(backend.order_columns(3, 1, 5, 1, np.array([2.5]))))
+    assert len(rows) == 3
+    for row in rows:
+        assert type(row['user_id']) is int
+        assert type(row['total_price']) is float
+        assert type(row['status']) is str
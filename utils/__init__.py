@@ -1,4 +1,4 @@
-from .config import Config
-from .validator import Validator
+from .config import Config, ConfigSnapshot, ValidationConfig
+from .validator import ValidationStats, Validator
 
-__all__ = ['Config', 'Validator'] 
\ No newline at end of file
+__all__ = ['Config', 'ConfigSnapshot', 'ValidationConfig', 'ValidationStats', 'Validator']
@@ -1,10 +1,100 @@
 import os
+import time
+import threading
 import yaml
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, FrozenSet, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CONFIG_PATH = os.path.join(ROOT_DIR, 'config.yaml')
+
+# Environment variable that overrides database.url, e.g. to point a container at PostgreSQL
+DATABASE_URL_ENV = 'DATABASE_URL'
+
+# Seconds between mtime checks of the config file when hot reload is enabled
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class ValidationConfig:
+    """Typed validation rules"""
+    email_domains: FrozenSet[str] = frozenset()
+    phone_formats: Dict[str, str] = field(default_factory=dict)
+    min_age: int = 18
+    max_age: int = 100
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Everything derived from one read of the config file, computed once"""
+    path: Optional[str]
+    mtime: Optional[float]
+    values: Dict[str, Any]
+    database_path: Optional[str]
+    database_url: Optional[str]
+    export_directory: Optional[str]
+    logging: Dict[str, Any]
+    validation: ValidationConfig
+
+
+def _flatten(values: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Map every dotted key, including the ones of nested sections, to its value"""
+    flat = {}
+    for key, value in values.items():
+        dotted = f'{prefix}{key}'
+        flat[dotted] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{dotted}.'))
+    return flat
+
+
+def _project_path(path: Optional[str]) -> Optional[str]:
+    if path is None or os.path.isabs(path):
+        return path
+    return os.path.join(ROOT_DIR, path)
+
+
+def _database_url(flat: Dict[str, Any], database_path: Optional[str]) -> Optional[str]:
+    """SQLAlchemy URL of the database; a SQLite file at database.path unless a URL is given"""
+    url = os.environ.get(DATABASE_URL_ENV) or flat.get('database.url')
+    if url or database_path is None:
+        return url
+    return f'sqlite:///{database_path}'
+
+
+def compile_config(values: Dict[str, Any], path: Optional[str] = None, mtime: Optional[float] = None) -> ConfigSnapshot:
+    """Build the snapshot of a parsed configuration"""
+    flat = _flatten(values or {})
+    database_path = _project_path(flat.get('database.path'))
+    return ConfigSnapshot(
+        path=path,
+        mtime=mtime,
+        values=flat,
+        database_path=database_path,
+        database_url=_database_url(flat, database_path),
+        export_directory=_project_path(flat.get('export.output_directory')),
+        logging={
+            'level': flat.get('logging.level'),
+            'file': flat.get('logging.file'),
+            'format': flat.get('logging.format')
+        },
+        validation=ValidationConfig(
+            email_domains=frozenset(flat.get('validation.email_domains') or []),
+            phone_formats=dict(flat.get('validation.phone_formats') or {}),
+            min_age=flat.get('validation.min_age', 18),
+            max_age=flat.get('validation.max_age', 100)
+        )
+    )
+
 
 class Config:
     _instance = None
-    _config: Dict[str, Any] = {}
+    _snapshot: Optional[ConfigSnapshot] = None
+    _reload_interval: Optional[float] = None
+    _last_check = 0.0
+    _lock = threading.Lock()
+    _created_directories = set()
 
     def __new__(cls):
         if cls._instance is None:
@@ -12,64 +102,101 @@ class Config:
         return cls._instance
 
     def __init__(self):
-        if not self._config:
+        if self._snapshot is None:
             self.load_config()
 
     @classmethod
-    def load_config(cls, config_path: str = 'config.yaml'):
+    def load_config(cls, config_path: str = DEFAULT_CONFIG_PATH):
         """Load configuration from YAML file"""
+        config_path = os.path.abspath(config_path)
         try:
+            mtime = os.stat(config_path).st_mtime
             with open(config_path, 'r') as f:
-                cls._config = yaml.safe_load(f)
+                values = yaml.safe_load(f)
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing configuration file: {e}")
+        cls._snapshot = compile_config(values, config_path, mtime)
+        cls._last_check = time.monotonic()
+
+    @classmethod
+    def enable_hot_reload(cls, interval: float = DEFAULT_RELOAD_INTERVAL):
+        """Reload the file on access once its mtime changes, checking at most once per interval"""
+        cls._reload_interval = interval
+
+    @classmethod
+    def disable_hot_reload(cls):
+        cls._reload_interval = None
+
+    @classmethod
+    def snapshot(cls) -> ConfigSnapshot:
+        """The current compiled configuration"""
+        if cls._snapshot is None:
+            cls.load_config()
+        elif cls._reload_interval is not None and time.monotonic() - cls._last_check >= cls._reload_interval:
+            cls._reload_if_changed()
+        return cls._snapshot
+
+    @classmethod
+    def _reload_if_changed(cls):
+        with cls._lock:
+            if time.monotonic() - cls._last_check < cls._reload_interval:
+                return
+            cls._last_check = time.monotonic()
+            path = cls._snapshot.path
+            try:
+                changed = path is not None and os.stat(path).st_mtime != cls._snapshot.mtime
+            except FileNotFoundError:
+                # Keep serving the last good configuration while the file is being replaced
+                return
+            if changed:
+                try:
+                    cls.load_config(path)
+                except (FileNotFoundError, ValueError):
+                    return
 
     @classmethod
     def get(cls, key: str, default: Any = None) -> Any:
         """Get configuration value by key"""
-        keys = key.split('.')
-        value = cls._config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k, default)
-            else:
-                return default
-        return value
+        return cls.snapshot().values.get(key, default)
 
     @classmethod
     def get_database_path(cls) -> str:
         """Get database path from configuration"""
-        db_path = cls.get('database.path')
-        if not os.path.isabs(db_path):
-            db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), db_path)
-        return db_path
+        return cls.snapshot().database_path
+
+    @classmethod
+    def get_database_url(cls) -> str:
+        """Get the SQLAlchemy database URL from configuration"""
+        return cls.snapshot().database_url
 
     @classmethod
     def get_export_directory(cls) -> str:
         """Get export directory from configuration"""
-        export_dir = cls.get('export.output_directory')
-        if not os.path.isabs(export_dir):
-            export_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), export_dir)
-        os.makedirs(export_dir, exist_ok=True)
+        export_dir = cls.snapshot().export_directory
+        if export_dir not in cls._created_directories:
+            os.makedirs(export_dir, exist_ok=True)
+            cls._created_directories.add(export_dir)
         return export_dir
 
     @classmethod
     def get_logging_config(cls) -> Dict[str, Any]:
         """Get logging configuration"""
-        return {
-            'level': cls.get('logging.level'),
-            'file': cls.get('logging.file'),
-            'format': cls.get('logging.format')
-        }
+        return dict(cls.snapshot().logging)
 
     @classmethod
     def get_validation_config(cls) -> Dict[str, Any]:
         """Get validation configuration"""
+        validation = cls.snapshot().validation
         return {
-            'email_domains': cls.get('validation.email_domains', []),
-            'phone_formats': cls.get('validation.phone_formats', {}),
-            'min_age': cls.get('validation.min_age', 18),
-            'max_age': cls.get('validation.max_age', 100)
-        } 
\ No newline at end of file
+            'email_domains': sorted(validation.email_domains),
+            'phone_formats': dict(validation.phone_formats),
+            'min_age': validation.min_age,
+            'max_age': validation.max_age
+        }
+
+    @classmethod
+    def validation(cls) -> ValidationConfig:
+        """Typed validation rules of the current configuration"""
+        return cls.snapshot().validation
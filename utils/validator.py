@@ -1,45 +1,184 @@
 import re
+import numpy as np
+from collections.abc import Mapping
 from datetime import datetime, date
-from typing import Optional, Dict, Any
-from .config import Config
+from enum import IntFlag
+from typing import Optional, Dict, Any, FrozenSet, Pattern
+from .config import Config, ValidationConfig
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+ORDER_STATUSES = frozenset(['pending', 'completed', 'cancelled'])
+
+
+class UserError(IntFlag):
+    """Bits of the per-row error mask returned by validate_users"""
+    EMAIL = 1
+    PHONE = 2
+    AGE = 4
+
+
+class ProductError(IntFlag):
+    """Bits of the per-row error mask returned by validate_products"""
+    NAME = 1
+    PRICE = 2
+    STOCK_QUANTITY = 4
+
+
+class OrderError(IntFlag):
+    """Bits of the per-row error mask returned by validate_orders"""
+    USER_ID = 1
+    PRODUCT_ID = 2
+    QUANTITY = 4
+    TOTAL_PRICE = 8
+    STATUS = 16
+
+
+class ValidationStats:
+    """Rows drawn, accepted and redrawn while generating one entity under validation"""
+
+    def __init__(self):
+        self.generated = 0
+        self.accepted = 0
+        self.regenerated = 0
+        self.regeneration_seconds = 0.0
+
+    @property
+    def acceptance_rate(self) -> Optional[float]:
+        return self.accepted / self.generated if self.generated else None
+
+    def merge(self, other: 'ValidationStats'):
+        self.generated += other.generated
+        self.accepted += other.accepted
+        self.regenerated += other.regenerated
+        self.regeneration_seconds += other.regeneration_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'generated': self.generated,
+            'accepted': self.accepted,
+            'regenerated': self.regenerated,
+            'acceptance_rate': self.acceptance_rate,
+            'regeneration_seconds': self.regeneration_seconds
+        }
+
+
+def _column(data, name: str):
+    """One column of a DataFrame, a dict of columns or a sequence of row dicts"""
+    if hasattr(data, 'columns') or isinstance(data, Mapping):
+        return data[name] if name in data else [None] * _row_count(data)
+    return [row.get(name) for row in data]
+
+
+def _row_count(data) -> int:
+    if hasattr(data, 'columns'):
+        return len(data)
+    if isinstance(data, Mapping):
+        return len(next(iter(data.values()))) if data else 0
+    return len(data)
+
+
+def _array(values) -> np.ndarray:
+    # Typed columns keep their dtype; lists stay objects, since NumPy would coerce mixed values to strings
+    return np.asarray(values) if hasattr(values, 'dtype') else np.asarray(values, dtype=object)
+
+
+def _truthy(values) -> np.ndarray:
+    """bool(value) per row, without a Python loop for numeric columns"""
+    array = _array(values)
+    if array.dtype.kind in 'iufb':
+        return array != 0
+    return np.fromiter((bool(value) for value in array.tolist()), dtype=bool, count=len(array))
+
+
+def _numbers(values, integer: bool = False) -> np.ndarray:
+    """Values as floats, with NaN wherever the row-wise isinstance check would fail"""
+    array = _array(values)
+    if array.dtype.kind in 'iub' or (array.dtype.kind == 'f' and not integer):
+        return array.astype(float)
+    types = int if integer else (int, float)
+    return np.fromiter((value if isinstance(value, types) else np.nan for value in array.tolist()),
+                       dtype=float, count=len(array))
+
 
 class Validator:
     def __init__(self):
         self.config = Config()
-        self.validation_config = self.config.get_validation_config()
+        self._rules = self.config.validation()
+        self._phone_patterns: Dict[str, Optional[Pattern]] = {}
+
+    @property
+    def rules(self) -> ValidationConfig:
+        """Validation rules of the current config snapshot, following hot reloads"""
+        rules = self.config.validation()
+        if rules is not self._rules:
+            self._rules = rules
+            self._phone_patterns = {}
+        return rules
+
+    @property
+    def validation_config(self) -> Dict[str, Any]:
+        return self.config.get_validation_config()
+
+    def _phone_pattern(self, locale: str) -> Optional[Pattern]:
+        """Compiled phone pattern of a locale, built once per locale"""
+        rules = self.rules
+        if locale not in self._phone_patterns:
+            phone_format = rules.phone_formats.get(locale)
+            # Everything but the '#' digit placeholders is matched literally
+            self._phone_patterns[locale] = (
+                re.compile(f"^{re.escape(phone_format).replace(re.escape('#'), r'[0-9]')}$") if phone_format else None
+            )
+        return self._phone_patterns[locale]
 
     def validate_email(self, email: str) -> bool:
         """Validate email format and domain"""
+        return self._valid_email(email, self.rules.email_domains)
+
+    @staticmethod
+    def _valid_email(email: str, domains: FrozenSet[str]) -> bool:
         if not email:
             return False
         
         # Basic email format validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not EMAIL_PATTERN.match(email):
             return False
         
         # Domain validation
         domain = email.split('@')[1]
-        return domain in self.validation_config['email_domains']
+        return domain in domains
 
     def validate_phone(self, phone: str, locale: str) -> bool:
         """Validate phone number format"""
         if not phone:
             return False
         
-        phone_format = self.validation_config['phone_formats'].get(locale)
-        if not phone_format:
+        pattern = self._phone_pattern(locale)
+        if pattern is None:
             return True  # Skip validation if no format specified for locale
         
-        # Convert format to regex pattern
-        pattern = phone_format.replace('#', r'\d')
-        return bool(re.match(f'^{pattern}$', phone))
+        return bool(pattern.match(phone))
 
     def validate_age(self, birth_date: date) -> bool:
         """Validate age is within configured range"""
         today = date.today()
         age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-        return self.validation_config['min_age'] <= age <= self.validation_config['max_age']
+        rules = self.rules
+        return rules.min_age <= age <= rules.max_age
+
+    def valid_ages(self, birth_dates, today: Optional[date] = None) -> np.ndarray:
+        """Vectorized validate_age on today, by default the current date; missing birth dates count as born today"""
+        today = today or date.today()
+        days = np.asarray(birth_dates, dtype='datetime64[D]')
+        days = np.where(np.isnat(days), np.datetime64(today, 'D'), days)
+        months = days.astype('datetime64[M]')
+        year = days.astype('datetime64[Y]').astype(int) + 1970
+        month = months.astype(int) % 12 + 1
+        day = (days - months).astype(int) + 1
+        before_birthday = (month > today.month) | ((month == today.month) & (day > today.day))
+        age = today.year - year - before_birthday
+        rules = self.rules
+        return (age >= rules.min_age) & (age <= rules.max_age)
 
     def validate_user(self, user_data: Dict[str, Any], locale: str) -> Dict[str, Any]:
         """Validate user data"""
@@ -93,10 +232,60 @@ class Validator:
         if not isinstance(order_data.get('total_price'), (int, float)) or order_data.get('total_price') <= 0:
             errors.append('Invalid total price')
         
-        if order_data.get('status') not in ['pending', 'completed', 'cancelled']:
+        if order_data.get('status') not in ORDER_STATUSES:
             errors.append('Invalid status')
         
         return {
             'is_valid': len(errors) == 0,
             'errors': errors
-        } 
\ No newline at end of file
+        }
+
+    def validate_users(self, data, locale: str, today: Optional[date] = None) -> np.ndarray:
+        """Validate a batch of users (DataFrame, dict of columns or row dicts) into UserError bitmasks"""
+        phone_pattern = self._phone_pattern(locale)
+        phones = _column(data, 'phone')
+        count = _row_count(data)
+        # Missing values may arrive as NaN from pandas, so anything but a string fails
+        domains = self.rules.email_domains
+        email_ok = np.fromiter((isinstance(email, str) and self._valid_email(email, domains)
+                                for email in _column(data, 'email')), dtype=bool, count=count)
+        phone_ok = np.fromiter((isinstance(phone, str) and bool(phone)
+                                and (phone_pattern is None or phone_pattern.match(phone) is not None)
+                                for phone in phones), dtype=bool, count=count)
+        age_ok = self.valid_ages(_column(data, 'birth_date'), today)
+        return (
+            np.where(email_ok, 0, UserError.EMAIL.value)
+            | np.where(phone_ok, 0, UserError.PHONE.value)
+            | np.where(age_ok, 0, UserError.AGE.value)
+        ).astype(np.uint8)
+
+    def validate_products(self, data) -> np.ndarray:
+        """Validate a batch of products into ProductError bitmasks"""
+        name_ok = _truthy(_column(data, 'name'))
+        price_ok = _numbers(_column(data, 'price')) > 0
+        stock_ok = _numbers(_column(data, 'stock_quantity'), integer=True) >= 0
+        return (
+            np.where(name_ok, 0, ProductError.NAME.value)
+            | np.where(price_ok, 0, ProductError.PRICE.value)
+            | np.where(stock_ok, 0, ProductError.STOCK_QUANTITY.value)
+        ).astype(np.uint8)
+
+    def validate_orders(self, data) -> np.ndarray:
+        """Validate a batch of orders into OrderError bitmasks"""
+        user_ok = _truthy(_column(data, 'user_id'))
+        product_ok = _truthy(_column(data, 'product_id'))
+        quantity_ok = _numbers(_column(data, 'quantity'), integer=True) > 0
+        total_ok = _numbers(_column(data, 'total_price')) > 0
+        statuses = _array(_column(data, 'status'))
+        if statuses.dtype.kind == 'U':
+            status_ok = np.isin(statuses, list(ORDER_STATUSES))
+        else:
+            status_ok = np.fromiter((status in ORDER_STATUSES for status in statuses.tolist()),
+                                    dtype=bool, count=len(statuses))
+        return (
+            np.where(user_ok, 0, OrderError.USER_ID.value)
+            | np.where(product_ok, 0, OrderError.PRODUCT_ID.value)
+            | np.where(quantity_ok, 0, OrderError.QUANTITY.value)
+            | np.where(total_ok, 0, OrderError.TOTAL_PRICE.value)
+            | np.where(status_ok, 0, OrderError.STATUS.value)
+        ).astype(np.uint8)
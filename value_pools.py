@@ -0,0 +1,116 @@
+import os
+import json
+import random
+import zlib
+import logging
+from typing import Callable, Collection, Dict, List, Optional
+from faker import Faker
+
+logger = logging.getLogger(__name__)
+
+# Default number of values pre-generated per field
+DEFAULT_POOL_SIZE = 50000
+
+# Faker providers for the text-heavy fields that are worth pooling
+FIELD_PROVIDERS: Dict[str, Callable[[Faker], str]] = {
+    'name': lambda fake: fake.name(),
+    'email': lambda fake: fake.email(),
+    'address': lambda fake: fake.address().replace('\n', ', '),
+    'phone': lambda fake: fake.phone_number(),
+    'word': lambda fake: fake.word(),
+    'text': lambda fake: fake.text(),
+}
+
+
+class ValuePool:
+    """Pre-generated Faker values per field, sampled by index instead of calling providers per row"""
+
+    def __init__(self, locale: str = 'en_US', size: int = DEFAULT_POOL_SIZE,
+                 cache_dir: Optional[str] = None, unique_emails: bool = False, seed: Optional[int] = None,
+                 email_domains: Optional[Collection[str]] = None):
+        self.locale = locale
+        self.size = size
+        self.unique_emails = unique_emails
+        self.rng = random.Random(seed)
+        self._email_counter = 0
+        self.values: Dict[str, List[str]] = {}
+
+        cache_path = self.cache_path(cache_dir, locale) if cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            self.load(cache_path)
+        if not self._is_complete():
+            fake = Faker(locale)
+            if seed is not None:
+                fake.seed_instance(seed)
+            self.build(fake)
+            if cache_path:
+                self.save(cache_path)
+        if email_domains:
+            self.restrict_email_domains(email_domains)
+
+    @staticmethod
+    def cache_path(cache_dir: str, locale: str) -> str:
+        return os.path.join(cache_dir, f'value_pool_{locale}.json')
+
+    def _is_complete(self) -> bool:
+        # The email pool is deduplicated, so it alone may hold fewer than size values
+        return all(
+            field in self.values and (field == 'email' or len(self.values[field]) >= self.size)
+            for field in FIELD_PROVIDERS
+        )
+
+    def build(self, fake: Faker):
+        """Generate every field's pool from the given Faker instance"""
+        for field, provider in FIELD_PROVIDERS.items():
+            values = [provider(fake) for _ in range(self.size)]
+            if field == 'email':
+                # Distinct base emails are what makes the unique email scheme collision free
+                values = list(dict.fromkeys(values))
+            self.values[field] = values
+        logger.info(f"Built value pools of {self.size} values for locale {self.locale}")
+
+    def restrict_email_domains(self, domains: Collection[str]):
+        """Move every pooled email onto one of domains, keeping the pool free of duplicates"""
+        allowed = sorted(domains)
+        emails = []
+        for email in self.values['email']:
+            local, domain = email.split('@', 1)
+            if domain not in domains:
+                # Keyed by the local part, so the same pool maps the same way on every run
+                domain = allowed[zlib.crc32(local.encode()) % len(allowed)]
+            emails.append(f'{local}@{domain}')
+        # Unique emails are derived from distinct base emails, so collisions must be dropped here
+        self.values['email'] = list(dict.fromkeys(emails))
+
+    def save(self, path: str):
+        """Persist the pools to disk"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.values, f, ensure_ascii=False)
+
+    def load(self, path: str):
+        """Load pools previously written by save"""
+        with open(path, 'r', encoding='utf-8') as f:
+            self.values = json.load(f)
+
+    def seed(self, seed: int):
+        self.rng.seed(seed)
+
+    def sample(self, field: str) -> str:
+        return self.rng.choice(self.values[field])
+
+    def email(self, index: Optional[int] = None) -> str:
+        """Sample an email, or in unique mode derive a distinct one from index"""
+        if not self.unique_emails:
+            return self.sample('email')
+        if index is None:
+            index = self._email_counter
+            self._email_counter += 1
+        emails = self.values['email']
+        base = emails[index % len(emails)]
+        cycle = index // len(emails)
+        if cycle == 0:
+            return base
+        # Faker never emits '+', so tagged addresses cannot clash with pooled ones
+        local, domain = base.split('@', 1)
+        return f'{local}+{cycle}@{domain}'
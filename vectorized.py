@@ -0,0 +1,61 @@
+import numpy as np
+from typing import Dict, Any, Iterator, Optional, Sequence
+
+# Blocks smaller than this are cheaper to draw through Faker one row at a time
+VECTORIZE_MIN_BATCH = 1000
+
+# Rows drawn per NumPy call, which bounds the size of the column arrays
+VECTORIZE_BLOCK_SIZE = 10000
+
+ORDER_STATUSES = ('pending', 'completed', 'cancelled')
+
+
+class VectorizedBackend:
+    """Draw whole numeric and categorical columns at once with a NumPy generator"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+        self._statuses = np.array(ORDER_STATUSES)
+
+    def user_columns(self, count: int) -> Dict[str, np.ndarray]:
+        """Columns matching fake.boolean()"""
+        return {
+            'is_active': self.rng.random(count) < 0.5
+        }
+
+    def product_columns(self, count: int) -> Dict[str, np.ndarray]:
+        """Columns matching fake.pyfloat(left_digits=2, right_digits=2, positive=True) and fake.random_int(0, 1000)"""
+        return {
+            'price': self.rng.integers(1, 10000, count) / 100,
+            'stock_quantity': self.rng.integers(0, 1001, count)
+        }
+
+    def order_columns(self, count: int, first_user_id: int, num_users: int,
+                      first_product_id: int, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Order columns with foreign keys drawn from the given id ranges"""
+        product_offsets = self.rng.integers(0, len(prices), count)
+        quantity = self.rng.integers(1, 11, count)
+        return {
+            'user_id': self.rng.integers(first_user_id, first_user_id + num_users, count),
+            'product_id': first_product_id + product_offsets,
+            'quantity': quantity,
+            'total_price': quantity * prices[product_offsets],
+            'status': self._statuses[self.rng.integers(0, len(self._statuses), count)]
+        }
+
+
+def price_array(product_prices: Dict[int, float], first_id: int, count: int) -> np.ndarray:
+    """Prices of a contiguous product id range as an array indexed by id offset"""
+    return np.fromiter((product_prices[first_id + offset] for offset in range(count)), dtype=float, count=count)
+
+
+def iter_rows(columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, Any]]:
+    """Yield row dicts of plain Python values from equal-length columns"""
+    names = list(columns)
+    for values in zip(*(columns[name].tolist() for name in names)):
+        yield dict(zip(names, values))
+
+
+def blocks(count: int, block_size: int = VECTORIZE_BLOCK_SIZE) -> Sequence[int]:
+    """Sizes of the blocks a run of count rows is drawn in"""
+    return [min(block_size, count - start) for start in range(0, count, block_size)]
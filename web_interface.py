@@ -71,7 +71,7 @@ def main():
         
         # Export Settings
         st.header("Export Options")
-        export_format = st.selectbox("Export Format", ["CSV", "JSON"])
+        export_format = st.selectbox("Export Format", ["CSV", "JSON", "Parquet", "Feather"])
         if st.button("Export Data", key="export"):
             with st.spinner("Exporting data..."):
                 st.session_state.generator.export_data(export_format.lower())